@@ -2,7 +2,6 @@ from abc import abstractmethod
 from functools import reduce
 import itertools as it
 from fractions import Fraction
-import math
 import numpy as np
 from pathlib import Path
 import pickle
@@ -92,6 +91,37 @@ def sample_cohesion_ballot_types(
     return ballots
 
 
+def sample_pl_rankings(support, num_ballots: int, ranking_length: int) -> np.ndarray:
+    """
+    Samples rankings from the Plackett-Luce distribution for a batch of ballots at once,
+    by perturbing the log support with Gumbel noise and sorting (Gumbel-top-k).
+
+    Args:
+        support (list[float]): Support for each candidate, summing to 1.
+        num_ballots (int): The number of rankings to sample.
+        ranking_length (int): The number of candidates in each ranking. If this is more than
+            the number of candidates with non-zero support, the candidates with zero support
+            fill the end of each ranking in a uniformly random order.
+
+    Returns:
+      An integer array of shape ``(num_ballots, ranking_length)``, where each row holds the
+      indices into ``support`` of the ranked candidates, from top to bottom.
+    """
+    support = np.asarray(support, dtype=float)
+    noise = np.random.gumbel(size=(num_ballots, len(support)))
+    with np.errstate(divide="ignore"):
+        keys = np.log(support) + noise
+
+    if ranking_length <= np.count_nonzero(support):
+        return np.argsort(-keys, axis=1)[:, :ranking_length]
+
+    # candidates with no support would all tie at -inf, so they are placed after every
+    # supported candidate and ordered among themselves by their noise alone
+    no_support = np.broadcast_to(support == 0, keys.shape)
+    keys = np.where(no_support, noise, keys)
+    return np.lexsort((-keys, no_support), axis=1)[:, :ranking_length]
+
+
 class BallotGenerator:
     """
     Base class for ballot generation models that use the candidate simplex
@@ -255,20 +285,6 @@ class BallotGenerator:
         """
         pass
 
-    @staticmethod
-    def _round_num(num: float) -> int:
-        """
-        Rounds up or down a float randomly.
-
-        Args:
-            num (float): Number to round.
-
-        Returns:
-            int: A whole number.
-        """
-        rand = np.random.random()
-        return math.ceil(num) if rand > 0.5 else math.floor(num)
-
     @staticmethod
     def ballot_pool_to_profile(ballot_pool, candidates) -> PreferenceProfile:
         """
@@ -298,6 +314,92 @@ class BallotGenerator:
 
         return PreferenceProfile(ballots=ballot_list, candidates=candidates)
 
+    def _fill_slate_ballot_types(
+        self, ballot_types: list, pref_intervals: dict, zero_cands: set
+    ) -> list[Ballot]:
+        """
+        Given sampled ballot types, fills each slate position with that slate's next
+        candidate, ordered by Plackett-Luce on the slate's preference interval.
+
+        Args:
+            ballot_types (list): A list of ballot types, each a sequence of the bloc names in
+                the order they appear on that ballot.
+            pref_intervals (dict): Dictionary whose keys are bloc strings and values are
+                ``PreferenceInterval`` objects for one voter bloc.
+            zero_cands (set): Candidates with no support, ranked tied at the bottom of every
+                ballot.
+
+        Returns:
+            list[Ballot]: A list of ballots with weight 1, one per ballot type.
+        """
+        num_ballots = len(ballot_types)
+
+        # each slate's candidates and their support, built once per bloc, and every
+        # ballot's ordering of them sampled at once
+        slate_cands = {}
+        slate_orderings = {}
+        for b in self.blocs:
+            cands = list(pref_intervals[b].non_zero_cands)
+
+            # if there are no non-zero candidates, skip this bloc
+            if len(cands) == 0:
+                continue
+
+            support = np.fromiter(
+                (pref_intervals[b].interval[c] for c in cands),
+                dtype=float,
+                count=len(cands),
+            )
+            slate_cands[b] = cands
+            slate_orderings[b] = sample_pl_rankings(support, num_ballots, len(cands))
+
+        ballot_pool = [Ballot()] * num_ballots
+        for j, bt in enumerate(ballot_types):
+            # position of the next candidate to take from each slate's ordering
+            next_position = {b: 0 for b in slate_orderings}
+
+            ranking = [frozenset({-1})] * len(bt)
+            for i, b in enumerate(bt):
+                ranking[i] = frozenset(
+                    {slate_cands[b][slate_orderings[b][j, next_position[b]]]}
+                )
+                next_position[b] += 1
+
+            if len(zero_cands) > 0:
+                ranking.append(frozenset(zero_cands))
+            ballot_pool[j] = Ballot(ranking=tuple(ranking), weight=Fraction(1, 1))
+
+        return ballot_pool
+
+    @staticmethod
+    def _index_pool_to_ballots(
+        index_pool: np.ndarray, candidates: list, num_ranked: Optional[int] = None
+    ) -> list[Ballot]:
+        """
+        Given a matrix of sampled rankings, whose rows hold indices into ``candidates``,
+        counts the distinct rows and converts each to a ``Ballot`` once.
+
+        Args:
+            index_pool (np.ndarray): An integer array with one row per ballot.
+            candidates (list): A list of candidate strings.
+            num_ranked (int, optional): Number of columns ranked one candidate per position.
+                The remaining columns are ranked as a single tied set at the bottom of the
+                ballot. Defaults to None, which ranks every column.
+
+        Returns:
+            list[Ballot]: A list of ballots, weighted by how many rows share their ranking.
+        """
+        rows, counts = np.unique(index_pool, axis=0, return_counts=True)
+        ballots = [Ballot()] * len(rows)
+
+        for i, (row, count) in enumerate(zip(rows, counts)):
+            ranking = [frozenset({candidates[j]}) for j in row[:num_ranked]]
+            if num_ranked is not None and len(row) > num_ranked:
+                ranking.append(frozenset(candidates[j] for j in row[num_ranked:]))
+            ballots[i] = Ballot(ranking=tuple(ranking), weight=Fraction(int(count)))
+
+        return ballots
+
 
 class BallotSimplex(BallotGenerator):
     """
@@ -527,7 +629,6 @@ class short_name_PlackettLuce(BallotGenerator):
         for bloc in self.blocs:
             # number of voters in this bloc
             num_ballots = ballots_per_block[bloc]
-            ballot_pool = [Ballot()] * num_ballots
             non_zero_cands = list(self.pref_interval_by_bloc[bloc].non_zero_cands)
             pref_interval_values = [
                 self.pref_interval_by_bloc[bloc].interval[c] for c in non_zero_cands
@@ -543,36 +644,26 @@ class short_name_PlackettLuce(BallotGenerator):
                 number_tied = number_to_sample - len(non_zero_cands)
                 number_to_sample = len(non_zero_cands)
 
-            for i in range(num_ballots):
-                # generates ranking based on probability distribution of non candidate support
-                # samples ballot_length candidates
-                non_zero_ranking = list(
-                    np.random.choice(
-                        non_zero_cands,
-                        number_to_sample,
-                        p=pref_interval_values,
-                        replace=False,
-                    )
-                )
-
-                ranking = [frozenset({cand}) for cand in non_zero_ranking]
-
-                if number_tied:
-                    tied_candidates = list(
-                        np.random.choice(
-                            zero_cands,
-                            number_tied,
-                            replace=False,
-                        )
-                    )
-                    ranking.append(frozenset(tied_candidates))
+            index_pool = sample_pl_rankings(
+                pref_interval_values, num_ballots, number_to_sample
+            )
 
-                ballot_pool[i] = Ballot(ranking=tuple(ranking), weight=Fraction(1, 1))
+            if number_tied:
+                # a uniformly random set of zero support candidates, sorted so that
+                # equal sets give equal rows
+                tied = np.argsort(
+                    np.random.random((num_ballots, len(zero_cands))), axis=1
+                )[:, :number_tied]
+                index_pool = np.hstack(
+                    (index_pool, np.sort(tied, axis=1) + len(non_zero_cands))
+                )
 
             # create PP for this bloc
-            pp = PreferenceProfile(ballots=ballot_pool)
-            pp = pp.condense_ballots()
-            pp_by_bloc[bloc] = pp
+            pp_by_bloc[bloc] = PreferenceProfile(
+                ballots=self._index_pool_to_ballots(
+                    index_pool, non_zero_cands + zero_cands, number_to_sample
+                )
+            )
 
         # combine the profiles
         pp = PreferenceProfile(ballots=[])
@@ -718,18 +809,27 @@ class name_BradleyTerry(BallotGenerator):
         Returns:
             dict: a mapping of the rankings to their probability
         """
-        ranking_to_prob = {}
+        rankings_by_length: dict[int, list[tuple]] = {}
         for ranking in permutations:
-            prob = 1
-            for i in range(len(ranking)):
-                cand_i = ranking[i]
-                greater_cand_support = cand_support_dict[cand_i]
-                for j in range(i + 1, len(ranking)):
-                    cand_j = ranking[j]
-                    cand_support = cand_support_dict[cand_j]
-                    prob *= greater_cand_support / (greater_cand_support + cand_support)
-            ranking_to_prob[ranking] = prob
-        return ranking_to_prob
+            rankings_by_length.setdefault(len(ranking), []).append(ranking)
+
+        # rankings of the same length share one product over their (i, j) pairs,
+        # where i is ranked above j
+        prob_by_ranking: dict[tuple, float] = {}
+        for length, rankings in rankings_by_length.items():
+            support = np.array(
+                [[cand_support_dict[c] for c in ranking] for ranking in rankings],
+                dtype=float,
+            ).reshape(len(rankings), length)
+            upper_i, upper_j = np.triu_indices(length, k=1)
+            greater_cand_support = support[:, upper_i]
+            cand_support = support[:, upper_j]
+            probs = np.prod(
+                greater_cand_support / (greater_cand_support + cand_support), axis=1
+            )
+            prob_by_ranking.update(zip(rankings, probs.tolist()))
+
+        return {ranking: prob_by_ranking[ranking] for ranking in permutations}
 
     def _make_pow(self, lst):
         """
@@ -1044,7 +1144,6 @@ class AlternatingCrossover(BallotGenerator):
         pp_by_bloc = {b: PreferenceProfile() for b in self.blocs}
 
         for i, bloc in enumerate(self.blocs):
-            ballot_pool = []
             num_bloc_ballots = ballots_per_type[(bloc, "bloc")]
             num_cross_ballots = ballots_per_type[(bloc, "cross")]
 
@@ -1060,42 +1159,35 @@ class AlternatingCrossover(BallotGenerator):
             )
             pref_for_bloc = list(pref_interval_dict[bloc].interval.values())
 
-            for i in range(num_cross_ballots + num_bloc_ballots):
-                bloc_cands = list(
-                    np.random.choice(
-                        bloc_cands,
-                        p=pref_for_bloc,
-                        size=len(bloc_cands),
-                        replace=False,
-                    )
-                )
-                opposing_cands = list(
-                    np.random.choice(
-                        opposing_cands,
-                        p=pref_for_opposing,
-                        size=len(opposing_cands),
-                        replace=False,
-                    )
-                )
+            num_ballots = num_cross_ballots + num_bloc_ballots
+            bloc_rankings = sample_pl_rankings(
+                pref_for_bloc, num_ballots, len(bloc_cands)
+            )
+            opposing_rankings = sample_pl_rankings(
+                pref_for_opposing, num_ballots, len(opposing_cands)
+            )
 
-                if i < num_cross_ballots:
-                    # alternate the bloc and opposing bloc candidates to create crossover ballots
-                    ranking = [
-                        frozenset({cand})
-                        for pair in zip(opposing_cands, bloc_cands)
-                        for cand in pair
-                    ]
-                else:
-                    ranking = [frozenset({c}) for c in bloc_cands] + [
-                        frozenset({c}) for c in opposing_cands
-                    ]
+            # index opposing candidates after the bloc candidates
+            opposing_rankings += len(bloc_cands)
+            all_cands = bloc_cands + opposing_cands
 
-                ballot = Ballot(ranking=tuple(ranking), weight=Fraction(1, 1))
-                ballot_pool.append(ballot)
+            # alternate the bloc and opposing bloc candidates to create crossover ballots
+            num_pairs = min(len(bloc_cands), len(opposing_cands))
+            cross_pool = np.empty((num_cross_ballots, 2 * num_pairs), dtype=int)
+            cross_pool[:, 0::2] = opposing_rankings[:num_cross_ballots, :num_pairs]
+            cross_pool[:, 1::2] = bloc_rankings[:num_cross_ballots, :num_pairs]
 
-            pp = PreferenceProfile(ballots=ballot_pool)
-            pp = pp.condense_ballots()
-            pp_by_bloc[bloc] = pp
+            bloc_pool = np.hstack(
+                (
+                    bloc_rankings[num_cross_ballots:],
+                    opposing_rankings[num_cross_ballots:],
+                )
+            )
+
+            ballot_pool = self._index_pool_to_ballots(
+                cross_pool, all_cands
+            ) + self._index_pool_to_ballots(bloc_pool, all_cands)
+            pp_by_bloc[bloc] = PreferenceProfile(ballots=ballot_pool)
 
         # combine the profiles
         pp = PreferenceProfile(ballots=[])
@@ -1327,7 +1419,10 @@ class CambridgeSampler(BallotGenerator):
 
             # Compute the pref interval for this bloc
             pref_interval_dict = combine_preference_intervals(
-                list(self.pref_intervals_by_bloc[bloc].values()),
+                [
+                    self.pref_intervals_by_bloc[bloc][bloc],
+                    self.pref_intervals_by_bloc[bloc][opp_bloc],
+                ],
                 [cohesion_parameters[bloc], 1 - cohesion_parameters[bloc]],
             )
 
@@ -1602,7 +1697,6 @@ class slate_PlackettLuce(BallotGenerator):
         for i, bloc in enumerate(self.blocs):
             # number of voters in this bloc
             num_ballots = ballots_per_block[bloc]
-            ballot_pool = [Ballot()] * num_ballots
             pref_intervals = self.pref_intervals_by_bloc[bloc]
             zero_cands = set(
                 it.chain(*[pi.zero_cands for pi in pref_intervals.values()])
@@ -1619,35 +1713,9 @@ class slate_PlackettLuce(BallotGenerator):
                 cohesion_parameters_for_bloc=self.cohesion_parameters[bloc],
             )
 
-            for j, bt in enumerate(ballot_types):
-                cand_ordering_by_bloc = {}
-
-                for b in self.blocs:
-                    # create a pref interval dict of only this blocs candidates
-                    bloc_cand_pref_interval = pref_intervals[b].interval
-                    cands = pref_intervals[b].non_zero_cands
-
-                    # if there are no non-zero candidates, skip this bloc
-                    if len(cands) == 0:
-                        continue
-
-                    distribution = [bloc_cand_pref_interval[c] for c in cands]
-
-                    # sample
-                    cand_ordering = np.random.choice(
-                        a=list(cands), size=len(cands), p=distribution, replace=False
-                    )
-                    cand_ordering_by_bloc[b] = list(cand_ordering)
-
-                ranking = [frozenset({-1})] * len(bt)
-                for i, b in enumerate(bt):
-                    # append the current first candidate, then remove them from the ordering
-                    ranking[i] = frozenset({cand_ordering_by_bloc[b][0]})
-                    cand_ordering_by_bloc[b].pop(0)
-
-                if len(zero_cands) > 0:
-                    ranking.append(frozenset(zero_cands))
-                ballot_pool[j] = Ballot(ranking=tuple(ranking), weight=Fraction(1, 1))
+            ballot_pool = self._fill_slate_ballot_types(
+                ballot_types, pref_intervals, zero_cands
+            )
 
             pp = PreferenceProfile(ballots=ballot_pool)
             pp = pp.condense_ballots()
@@ -1881,7 +1949,6 @@ class slate_BradleyTerry(BallotGenerator):
         for i, bloc in enumerate(self.blocs):
             # number of voters in this bloc
             num_ballots = ballots_per_block[bloc]
-            ballot_pool = [Ballot()] * num_ballots
             pref_intervals = self.pref_intervals_by_bloc[bloc]
             zero_cands = set(
                 it.chain(*[pi.zero_cands for pi in pref_intervals.values()])
@@ -1902,36 +1969,9 @@ class slate_BradleyTerry(BallotGenerator):
                     bloc=bloc, num_ballots=num_ballots
                 )
 
-            for j, bt in enumerate(ballot_types):
-                cand_ordering_by_bloc = {}
-
-                for b in self.blocs:
-                    # create a pref interval dict of only this blocs candidates
-                    bloc_cand_pref_interval = pref_intervals[b].interval
-                    cands = pref_intervals[b].non_zero_cands
-
-                    # if there are no non-zero candidates, skip this bloc
-                    if len(cands) == 0:
-                        continue
-
-                    distribution = [bloc_cand_pref_interval[c] for c in cands]
-
-                    # sample
-                    cand_ordering = np.random.choice(
-                        a=list(cands), size=len(cands), p=distribution, replace=False
-                    )
-
-                    cand_ordering_by_bloc[b] = list(cand_ordering)
-
-                ranking = [frozenset({-1})] * len(bt)
-                for i, b in enumerate(bt):
-                    # append the current first candidate, then remove them from the ordering
-                    ranking[i] = frozenset({cand_ordering_by_bloc[b][0]})
-                    cand_ordering_by_bloc[b].pop(0)
-
-                if len(zero_cands) > 0:
-                    ranking.append(frozenset(zero_cands))
-                ballot_pool[j] = Ballot(ranking=tuple(ranking), weight=Fraction(1, 1))
+            ballot_pool = self._fill_slate_ballot_types(
+                ballot_types, pref_intervals, zero_cands
+            )
 
             pp = PreferenceProfile(ballots=ballot_pool)
             pp = pp.condense_ballots()
@@ -1,29 +1,34 @@
 from fractions import Fraction
 import os
 import csv
+import numpy as np
 import pandas as pd
-from pandas.errors import EmptyDataError, DataError
+from pandas.errors import EmptyDataError, DataError, ParserError, ParserWarning
 import pathlib
-from typing import Optional
+import warnings
+from typing import IO, Iterable, Literal, Optional, Union
 
 from .pref_profile import PreferenceProfile
 from .ballot import Ballot
 
 
 def load_csv(
-    fpath: str,
+    fpath: Union[str, os.PathLike, IO[str]],
     rank_cols: list[int] = [],
     *,
     weight_col: Optional[int] = None,
     delimiter: Optional[str] = None,
     id_col: Optional[int] = None,
+    engine: Optional[Literal["c", "python", "pyarrow"]] = None,
+    chunksize: Optional[int] = None,
 ) -> PreferenceProfile:
     """
     Given a file path, loads cast vote record (cvr) with ranks as columns and voters as rows.
-    Empty cells are treated as None.
+    Empty cells are treated as None, and candidates and voter ids are read as strings.
 
     Args:
-        fpath (str): Path to cvr file.
+        fpath (str or IO[str]): Path to cvr file, or a file-like object such as ``io.StringIO``
+            holding the text of one.
         rank_cols (list[int]): List of column indexes that contain rankings. Indexing starts from 0,
             in order from top to bottom rank. Default is empty list, which implies that all columns
             contain rankings.
@@ -32,62 +37,194 @@ def load_csv(
         delimiter (str, optional): The character that breaks up rows. Defaults to None, which
             implies a carriage return.
         id_col (int, optional): Index for the column with voter ids. Defaults to None.
+        engine (str, optional): The pandas parser to read the file with, one of "c", "python"
+            or "pyarrow". The "pyarrow" engine reads large files on multiple threads, and requires
+            the ``pyarrow`` package. Defaults to None, which lets pandas choose, falling back to
+            the "python" engine for delimiters the "c" engine cannot handle. Unlike the others,
+            the "pyarrow" engine infers the types of numeric-looking cells. It cannot read
+            rows with fewer or more cells than the header, such as short ballots or rows
+            ending in a trailing delimiter, so files with such rows are read with the "c"
+            engine instead, with a ``ParserWarning``.
+        chunksize (int, optional): Number of rows to parse at a time. Only the ballots seen so
+            far are kept between chunks, which bounds the memory used on large files. Defaults to
+            None, which parses the whole file at once. Not supported by the "pyarrow" engine.
 
     Raises:
         FileNotFoundError: If fpath is invalid.
         EmptyDataError: If dataset is empty.
-        ValueError: If the voter id column has missing values.
+        ValueError: If the voter id column has missing values, or if chunksize is used with
+            the "pyarrow" engine.
         DataError: If the voter id column has duplicate values.
+        ParserError: If a row cannot be parsed.
 
     Returns:
         PreferenceProfile: A ``PreferenceProfile`` that represents all the ballots in the election.
     """
-    if not os.path.isfile(fpath):
-        raise FileNotFoundError(f"File with path {fpath} cannot be found")
-
-    cvr_path = pathlib.Path(fpath)
-    df = pd.read_csv(
-        cvr_path,
+    cvr_path: Union[pathlib.Path, IO[str]]
+    if isinstance(fpath, (str, os.PathLike)):
+        if not os.path.isfile(fpath):
+            raise FileNotFoundError(f"File with path {fpath} cannot be found")
+        # an empty file needs no parser to be rejected
+        if os.path.getsize(fpath) == 0:
+            raise EmptyDataError("Dataset cannot be empty")
+        cvr_path = pathlib.Path(fpath)
+    else:
+        cvr_path = fpath
+
+    read_options: dict = dict(
         on_bad_lines="error",
         encoding="utf8",
         index_col=False,
         delimiter=delimiter,
+        # pandas infers column types per chunk, so cells are read as text to give the
+        # same candidates however the file is split; empty cells stay missing
+        dtype=str,
     )
-
-    if df.empty:
+    chunks: Iterable[pd.DataFrame]
+    if engine == "pyarrow":
+        if chunksize is not None:
+            raise ValueError("The pyarrow engine cannot read a file in chunks")
+        chunks = [_read_csv_pyarrow(cvr_path, read_options)]
+    else:
+        # only pass an engine when one is asked for, so pandas can fall back to python
+        if engine is not None:
+            read_options["engine"] = engine
+        if chunksize is None:
+            chunks = [pd.read_csv(cvr_path, **read_options)]
+        else:
+            chunks = pd.read_csv(cvr_path, chunksize=chunksize, **read_options)
+
+    # ballots are merged across chunks by ranking, in the order they are first seen
+    weights: dict[tuple, Union[int, float]] = {}
+    voter_sets: dict[tuple, set] = {}
+    seen_ids: set = set()
+
+    for df in chunks:
+        if df.empty:
+            continue
+        if id_col is not None and df.iloc[:, id_col].isnull().values.any():  # type: ignore
+            raise ValueError(f"Missing value(s) in column at index {id_col}")
+        if id_col is not None:
+            ids = df.iloc[:, id_col]
+            if not ids.is_unique or not seen_ids.isdisjoint(ids):
+                raise DataError(f"Duplicate value(s) in column at index {id_col}")
+            seen_ids.update(ids)
+
+        if rank_cols:
+            if id_col is not None:
+                df = df.iloc[:, rank_cols + [id_col]]
+            else:
+                df = df.iloc[:, rank_cols]
+
+        rank_pos = [i for i in range(df.shape[1]) if i != id_col]
+        for ranking, weight, voters in _group_rankings(
+            df, rank_pos, id_col, weight_col
+        ):
+            weights[ranking] = weights.get(ranking, 0) + weight
+            if voters is not None:
+                voter_sets.setdefault(ranking, set()).update(voters)
+
+    if not weights:
         raise EmptyDataError("Dataset cannot be empty")
-    if id_col is not None and df.iloc[:, id_col].isnull().values.any():  # type: ignore
-        raise ValueError(f"Missing value(s) in column at index {id_col}")
-    if id_col is not None and not df.iloc[:, id_col].is_unique:
-        raise DataError(f"Duplicate value(s) in column at index {id_col}")
 
-    if rank_cols:
-        if id_col is not None:
-            df = df.iloc[:, rank_cols + [id_col]]
-        else:
-            df = df.iloc[:, rank_cols]
+    ballots = [
+        Ballot(
+            ranking=ranking,
+            weight=Fraction(weight),
+            voter_set=voter_sets.get(ranking),
+        )
+        for ranking, weight in weights.items()
+    ]
+
+    return PreferenceProfile(ballots=ballots)
+
 
-    ranks = list(df.columns)
+def _group_rankings(
+    df: pd.DataFrame,
+    rank_pos: list[int],
+    id_col: Optional[int],
+    weight_col: Optional[int],
+) -> list[tuple[tuple, Union[int, float], Optional[list]]]:
+    """
+    Groups the rows of a cvr by ranking, sorted as ``DataFrame.groupby`` would sort them.
+    Candidates are encoded as integers per rank column, so rows are grouped and weighed in
+    numpy rather than row by row.
+
+    Returns:
+        list[tuple]: A list of tuples ``(ranking, weight, voters)``, where voters is the list of
+        voter ids with that ranking, or None if there is no id column.
+    """
+    codes = np.empty((len(df), len(rank_pos)), dtype=np.int64)
+    labels = []
+    for j, pos in enumerate(rank_pos):
+        col_codes, uniques = pd.factorize(df.iloc[:, pos], sort=True)
+        # empty cells are coded -1 by pandas, and are moved to sort after every candidate
+        col_codes[col_codes == -1] = len(uniques)
+        codes[:, j] = col_codes
+        labels.append([frozenset({c}) for c in uniques.tolist()] + [frozenset({None})])
+
+    rows, inverse = np.unique(codes, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(inverse, minlength=len(rows))
+
+    if weight_col is not None:
+        row_weights = pd.to_numeric(df.iloc[:, weight_col]).to_numpy()
+        group_weights = np.zeros(len(rows), dtype=row_weights.dtype)
+        np.add.at(group_weights, inverse, row_weights)
+        weights = group_weights.tolist()
+    else:
+        weights = counts.tolist()
+
+    voters: list = [None] * len(rows)
     if id_col is not None:
-        ranks.remove(df.columns[id_col])
-    grouped = df.groupby(ranks, dropna=False)
-    ballots = []
+        ids = df.iloc[:, id_col].to_numpy()[np.argsort(inverse, kind="stable")].tolist()
+        ends = np.cumsum(counts).tolist()
+        voters = [ids[start:end] for start, end in zip([0] + ends[:-1], ends)]
 
-    for group, group_df in grouped:
-        ranking = tuple(
-            [frozenset({None}) if pd.isnull(c) else frozenset({c}) for c in group]
-        )
+    return [
+        (tuple(labels[j][code] for j, code in enumerate(row)), weight, group_voters)
+        for row, weight, group_voters in zip(rows.tolist(), weights, voters)
+    ]
 
-        voter_set = None
-        if id_col is not None:
-            voter_set = set(group_df.iloc[:, id_col])
-        weight = len(group_df)
-        if weight_col is not None:
-            weight = sum(group_df.iloc[:, weight_col])
-        b = Ballot(ranking=ranking, weight=Fraction(weight), voter_set=voter_set)
-        ballots.append(b)
 
-    return PreferenceProfile(ballots=ballots)
+def _read_csv_pyarrow(
+    cvr_path: Union[pathlib.Path, IO[str]], read_options: dict
+) -> pd.DataFrame:
+    """
+    Reads a cvr with the pyarrow engine, matching what the c engine returns for empty files
+    and empty cells. pyarrow rejects any row whose number of cells differs from the header,
+    so a file with such rows is read again with the c engine and ``read_options``.
+    """
+    start = None
+    if not isinstance(cvr_path, pathlib.Path) and cvr_path.seekable():
+        start = cvr_path.tell()
+
+    try:
+        df = pd.read_csv(
+            cvr_path,
+            encoding="utf8",
+            delimiter=read_options["delimiter"],
+            engine="pyarrow",
+        )
+    except ValueError as e:
+        # pyarrow cannot infer the columns of a file holding only a header without a newline
+        if "Empty CSV" in str(e):
+            raise EmptyDataError("Dataset cannot be empty") from e
+        if "CSV parse error" not in str(e):
+            raise
+        if not isinstance(cvr_path, pathlib.Path):
+            if start is None:
+                raise ParserError(str(e)) from e
+            cvr_path.seek(start)
+        warnings.warn(
+            "Falling back to the 'c' engine since the 'pyarrow' engine cannot read rows "
+            "with a different number of cells than the header",
+            ParserWarning,
+        )
+        return pd.read_csv(cvr_path, engine="c", **read_options)
+
+    # pyarrow reads empty cells in text columns as empty strings rather than missing values
+    return df.mask(df.eq(""))
 
 
 def load_scottish(
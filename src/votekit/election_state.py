@@ -1,6 +1,6 @@
+from dataclasses import dataclass, field
 import pandas as pd
-from pydantic import BaseModel
-from typing import Optional
+from typing import Iterator, Optional
 import json
 
 from .pref_profile import PreferenceProfile
@@ -9,7 +9,8 @@ from .utils import candidate_position_dict
 pd.set_option("display.colheader_justify", "left")
 
 
-class ElectionState(BaseModel):
+@dataclass(frozen=True)
+class ElectionState:
     """
     Class for storing information on each round of an election and the final outcome.
 
@@ -42,16 +43,98 @@ class ElectionState(BaseModel):
             previous round. Defaults to None.
     """
 
-    curr_round: int = 0
-    elected: list[set[str]] = []
-    eliminated_cands: list[set[str]] = []
-    remaining: list[set[str]] = []
     profile: PreferenceProfile
-    scores: dict = {}
+    curr_round: int = 0
+    elected: list[set[str]] = field(default_factory=list)
+    eliminated_cands: list[set[str]] = field(default_factory=list)
+    remaining: list[set[str]] = field(default_factory=list)
+    scores: dict = field(default_factory=dict)
     previous: Optional["ElectionState"] = None
 
-    class Config:
-        allow_mutation = False
+    # states are immutable, so the running winners, eliminated candidates and rankings
+    # are built once from the previous state, and other derived results are cached
+    _winners: tuple = field(default=(), init=False, repr=False, compare=False)
+    _eliminated: tuple = field(default=(), init=False, repr=False, compare=False)
+    _rankings: tuple = field(default=(), init=False, repr=False, compare=False)
+    _positions: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _rounds: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _status: Optional[pd.DataFrame] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # copy the caller's lists and the tie sets inside them, so changing them later
+        # cannot alter a frozen state or its cached rankings
+        object.__setattr__(self, "elected", [s.copy() for s in self.elected])
+        object.__setattr__(
+            self, "eliminated_cands", [s.copy() for s in self.eliminated_cands]
+        )
+        object.__setattr__(self, "remaining", [s.copy() for s in self.remaining])
+        object.__setattr__(self, "scores", dict(self.scores))
+
+        if self.previous is not None:
+            # eliminated candidates run from the latest round back to the first
+            winners = (*self.previous._winners, *self.elected)
+            eliminated = (*self.eliminated_cands, *self.previous._eliminated)
+        else:
+            winners = tuple(self.elected)
+            eliminated = tuple(self.eliminated_cands)
+
+        if self.remaining != [{}]:
+            rankings = (*winners, *self.remaining, *eliminated)
+        else:
+            rankings = winners + eliminated
+
+        object.__setattr__(self, "_winners", winners)
+        object.__setattr__(self, "_eliminated", eliminated)
+        object.__setattr__(self, "_rankings", rankings)
+
+    def _walk(self) -> Iterator["ElectionState"]:
+        """
+        Iterates over the chain of states, from the current round back to the first.
+        """
+        node: Optional[ElectionState] = self
+        while node is not None:
+            yield node
+            node = node.previous
+
+    def _round_table(self) -> dict[int, "ElectionState"]:
+        """
+        Maps each round number in the chain to the state for that round. Built on first
+        use and cached.
+        """
+        if self._rounds is not None:
+            return self._rounds
+
+        table: dict[int, ElectionState] = {}
+        for node in self._walk():
+            table.setdefault(node.curr_round, node)
+        object.__setattr__(self, "_rounds", table)
+
+        return table
+
+    def _ranking_positions(self) -> dict:
+        """
+        Maps each candidate to their position in the rankings, as given by
+        ``candidate_position_dict``. Built on first use and cached.
+        """
+        if self._positions is not None:
+            return self._positions
+
+        positions = candidate_position_dict(list(self._rankings))
+        object.__setattr__(self, "_positions", positions)
+
+        return positions
+
+    def _outcome(self) -> dict:
+        return {
+            "Elected": self.elected,
+            "Eliminated": self.eliminated_cands,
+            "Remaining": self.remaining,
+        }
 
     def winners(self) -> list[set[str]]:
         """
@@ -60,10 +143,7 @@ class ElectionState(BaseModel):
         Returns:
             list[set[str]]: A list of elected candidates ordered from first round to current round.
         """
-        if self.previous:
-            return self.previous.winners() + self.elected
-
-        return self.elected
+        return list(self._winners)
 
     def eliminated(self) -> list[set[str]]:
         """
@@ -74,10 +154,7 @@ class ElectionState(BaseModel):
                 A list of eliminated candidates ordered from current round to first
                 round.
         """
-        if self.previous:
-            return self.eliminated_cands + self.previous.eliminated()
-
-        return self.eliminated_cands
+        return list(self._eliminated)
 
     def rankings(self) -> list[set[str]]:
         """
@@ -88,10 +165,7 @@ class ElectionState(BaseModel):
                 List of all candidates in order of their ranking after each round,
                 first the winners, then remaining, then the eliminated candidates.
         """
-        if self.remaining != [{}]:
-            return self.winners() + self.remaining + self.eliminated()
-
-        return self.winners() + self.eliminated()
+        return list(self._rankings)
 
     def round_outcome(self, round: int) -> dict:
         """
@@ -103,18 +177,13 @@ class ElectionState(BaseModel):
         Returns:
             dict: A dictionary with elected, remaining, and eliminated candidates.
         """
-        if self.curr_round == round:
-            return {
-                "Elected": self.elected,
-                "Eliminated": self.eliminated_cands,
-                "Remaining": self.remaining,
-            }
-        elif self.previous:
-            return self.previous.round_outcome(round)
-        else:
+        node = self._round_table().get(round)
+        if node is None:
             raise ValueError("Round number out of range")
 
-    def get_scores(self, round: int = curr_round) -> dict:
+        return node._outcome()
+
+    def get_scores(self, round: Optional[int] = None) -> dict:
         """
         Get the scores for a desired round.
 
@@ -123,13 +192,14 @@ class ElectionState(BaseModel):
         Returns:
             dict: A dictionary of the candidate scores for the inputted round.
         """
-        if round == 0 or round > self.curr_round:
-            raise ValueError('Round number out of range"')
+        if round is None:
+            round = self.curr_round
 
-        if round == self.curr_round:
-            return self.scores
+        node = self._round_table().get(round)
+        if round == 0 or node is None:
+            raise ValueError('Round number out of range"')
 
-        return self.previous.get_scores(self.curr_round - 1)  # type: ignore
+        return node.scores
 
     def changed_rankings(self) -> dict:
         """
@@ -144,15 +214,29 @@ class ElectionState(BaseModel):
         if not self.previous:
             raise ValueError("This is the first round, cannot compare previous ranking")
 
-        prev_ranking: dict = candidate_position_dict(self.previous.rankings())
-        curr_ranking: dict = candidate_position_dict(self.rankings())
-        if curr_ranking == prev_ranking:
+        curr = self._rankings
+        prev = self.previous._rankings
+        if curr == prev:
             return {}
 
+        # tie sets before the first difference keep their positions
+        start = offset = 0
+        for curr_set, prev_set in zip(curr, prev):
+            if curr_set != prev_set:
+                break
+            start += 1
+            offset += len(curr_set)
+
+        prev_ranking = self.previous._ranking_positions()
         changes = {}
-        for candidate, index in curr_ranking.items():
-            if prev_ranking[candidate] != index:
-                changes[candidate] = (prev_ranking[candidate], index)
+        index = offset
+        for tie_set in curr[start:]:
+            for candidate in tie_set:
+                # a candidate missing from the previous round raises a KeyError
+                prev_index = prev_ranking[candidate]
+                if prev_index != index:
+                    changes[candidate] = (prev_index, index)
+            index += len(tie_set)
         return changes
 
     def status(self) -> pd.DataFrame:
@@ -164,40 +248,95 @@ class ElectionState(BaseModel):
                 Data frame displaying candidate, status (elected, eliminated,
                 remaining), and the round their status updated.
         """
-        all_cands = [c for s in self.rankings() for c in s]
+        return self._status_df().copy()
+
+    def _status_df(self) -> pd.DataFrame:
+        """
+        Builds the status data frame once and returns the cached frame, which must not be
+        modified.
+        """
+        if self._status is not None:
+            return self._status
+
+        all_cands, cand_to_status, cand_to_round = self._status_maps()
+        candidates = pd.Series(all_cands, dtype=object)
         status_df = pd.DataFrame(
             {
-                "Candidate": all_cands,
-                "Status": ["Remaining"] * len(all_cands),
-                "Round": [self.curr_round] * len(all_cands),
+                "Candidate": candidates,
+                "Status": candidates.map(cand_to_status)
+                .fillna("Remaining")
+                .astype(object),
+                "Round": candidates.map(cand_to_round)
+                .fillna(self.curr_round)
+                .astype("int64"),
             }
         )
+        object.__setattr__(self, "_status", status_df)
 
+        return status_df
+
+    def _status_maps(self) -> tuple[list, dict, dict]:
+        """
+        Returns the ranked candidates, and dictionaries mapping candidates to their latest
+        status and the round it was set. Candidates missing from the dictionaries are
+        remaining as of the current round.
+        """
+        all_cands = [c for s in self._rankings for c in s]
+        # candidate -> (status, tie set, round) of the latest round they appear in
+        latest: dict = {}
+
+        rounds = self._round_table()
         for round in range(1, self.curr_round + 1):
-            results = self.round_outcome(round)
+            if round not in rounds:
+                raise ValueError("Round number out of range")
+            results = rounds[round]._outcome()
             for status, ranking in results.items():
                 for s in ranking:
                     for cand in s:
-                        tied_str = ""
-                        # if tie
-                        if len(s) > 1:
-                            remaining_cands = ", ".join(list(s.difference(cand)))
-                            tied_str = f" (tie with {remaining_cands})"
+                        latest[cand] = (status, s, round)
 
-                        status_df.loc[status_df["Candidate"] == cand, "Status"] = (
-                            status + tied_str
-                        )
-                        status_df.loc[status_df["Candidate"] == cand, "Round"] = round
+        cand_to_status: dict = {}
+        cand_to_round: dict = {}
+        for cand, (status, s, round) in latest.items():
+            # if tie
+            if len(s) > 1:
+                remaining_cands = ", ".join(list(s.difference(cand)))
+                status = f"{status} (tie with {remaining_cands})"
+            cand_to_status[cand] = status
+            cand_to_round[cand] = round
 
-        return status_df
+        return all_cands, cand_to_status, cand_to_round
+
+    def _format_status(self) -> str:
+        """
+        Lays out the status table as ``DataFrame.to_string(index=False)`` would, without
+        building the data frame.
+        """
+        all_cands, cand_to_status, cand_to_round = self._status_maps()
+        if not all_cands:
+            return "Empty DataFrame\nColumns: [Candidate, Status, Round]\nIndex: []"
+
+        columns = [
+            ["Candidate"] + [str(c) for c in all_cands],
+            ["Status"] + [cand_to_status.get(c, "Remaining") for c in all_cands],
+            # pandas pads numeric column headers with a leading space
+            [" Round"]
+            + [str(cand_to_round.get(c, self.curr_round)) for c in all_cands],
+        ]
+        widths = [max(len(cell) for cell in col) for col in columns]
+
+        return "\n".join(
+            " ".join(cell.rjust(width) for cell, width in zip(row, widths))
+            for row in zip(*columns)
+        )
 
-    def to_dict(self, keep: list = []) -> dict:
+    def to_dict(self, keep: Optional[list] = None) -> dict:
         """
         Returns election results as a dictionary.
 
         Args:
             keep (list, optional): List of information to store in dictionary. Should be subset of
-                "elected", "eliminated", "remaining", "ranking". Defaults to empty list,
+                "elected", "eliminated", "remaining", "ranking". Defaults to None,
                 which stores all information.
 
         Returns:
@@ -206,10 +345,10 @@ class ElectionState(BaseModel):
         """
         keys = ["elected", "eliminated", "remaining", "ranking"]
         values: list = [
-            self.winners(),
-            self.eliminated(),
+            self._winners,
+            self._eliminated,
             self.remaining,
-            self.rankings(),
+            self._rankings,
         ]
 
         rv = {}
@@ -227,14 +366,14 @@ class ElectionState(BaseModel):
 
         return rv
 
-    def to_json(self, file_path: str, keep: list = []):
+    def to_json(self, file_path: str, keep: Optional[list] = None):
         """
         Saves election state object as a JSON file.
 
         Args:
             file_path (str): The name of the file path.
             keep (list, optional): List of information to store in dictionary, should be subset of
-                "elected", "eliminated", "remaining", "ranking". Defaults to empty list,
+                "elected", "eliminated", "remaining", "ranking". Defaults to None,
                 which stores all information.
         """
 
@@ -243,8 +382,9 @@ class ElectionState(BaseModel):
             outfile.write(json_dict)
 
     def __str__(self):
-        show = self.status()
+        if self._str is None:
+            object.__setattr__(self, "_str", self._format_status())
         print(f"Current Round: {self.curr_round}")
-        return show.to_string(index=False, justify="justify")
+        return self._str
 
     __repr__ = __str__
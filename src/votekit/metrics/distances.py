@@ -65,17 +65,13 @@ def lp_dist(
     electA = pp_2arry[:, 0]
     electB = pp_2arry[:, 1]
 
+    diff = np.abs(electA - electB)
+
     if isinstance(p_value, int):
-        sum = 0
-        for i in range(len(electA)):
-            diff = (abs(electA[i] - electB[i])) ** p_value
-            sum += diff
-        lp_dist = sum ** (1 / p_value)
-        return lp_dist
+        return np.sum(diff**p_value) ** (1 / p_value)
 
     elif p_value == "inf":
-        diff = [abs(x - y) for x, y in zip(electA, electB)]
-        return max(diff)
+        return np.max(diff)
 
     else:
         raise ValueError("Unsupported input type")
@@ -95,23 +91,16 @@ def profiles_to_ndarrys(profiles: list[PreferenceProfile]):
     Returns:
         numpy.ndarray: computed matrix of ballot frequencies.
     """
-    cast_ballots: list = []
-    profile_dicts: list[dict] = []
-    for pp in profiles:
-        election_dict = pp.to_dict(standardize=True)
-        profile_dicts.append(election_dict)
-        for key in election_dict.keys():
-            if key not in cast_ballots:
-                cast_ballots.append(key)
-    combined_dict = {ranking: 0 for ranking in cast_ballots}
-    rows = len(cast_ballots)
-    cols = len(profile_dicts)
-    electn_ndarry = np.zeros((rows, cols))
-
-    for i in range(len(profile_dicts)):
-        election = combined_dict | profile_dicts[i]
-        elect_distr = [float(election[key]) for key in sorted(election.keys())]
-        electn_ndarry[:, i] = elect_distr
+    profile_dicts = [pp.to_dict(standardize=True) for pp in profiles]
+
+    # rows follow the sorted order of every ranking cast in any of the profiles
+    cast_ballots = sorted({key for election in profile_dicts for key in election})
+    row_of = {ranking: i for i, ranking in enumerate(cast_ballots)}
+    electn_ndarry = np.zeros((len(cast_ballots), len(profile_dicts)))
+
+    for i, election in enumerate(profile_dicts):
+        rows = [row_of[key] for key in election]
+        electn_ndarry[rows, i] = [float(weight) for weight in election.values()]
     return electn_ndarry
 
 
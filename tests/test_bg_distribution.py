@@ -1,9 +1,13 @@
+from collections import Counter
+from functools import lru_cache
 import itertools as it
 import math
 import scipy.stats as stats
 from pathlib import Path
 import pickle
+import random
 import numpy as np
+import pytest
 
 from votekit.ballot_generator import (
     ImpartialAnonymousCulture,
@@ -17,60 +21,58 @@ from votekit.ballot_generator import (
     slate_BradleyTerry,
     name_Cumulative,
     sample_cohesion_ballot_types,
+    sample_pl_rankings,
 )
 from votekit.pref_profile import PreferenceProfile
 from votekit.pref_interval import PreferenceInterval, combine_preference_intervals
 from votekit import Ballot
 
-# set seed for more consistent tests
-np.random.seed(8675309)
 
+@pytest.fixture(autouse=True)
+def seed_random():
+    # set seed before every test, so each test draws the same numbers however
+    # the tests are ordered or split across workers
+    np.random.seed(8675309)
+    random.seed(8675309)
 
-def binomial_confidence_interval(probability, n_attempts, alpha=0.95):
-    # Calculate the mean and standard deviation of the binomial distribution
-    mean = n_attempts * probability
-    std_dev = math.sqrt(n_attempts * probability * (1 - probability))
 
-    # Calculate the confidence interval
-    z_score = stats.norm.ppf((1 + alpha) / 2)  # Z-score for 99% confidence level
-    margin_of_error = z_score * (std_dev)
-    conf_interval = (mean - margin_of_error, mean + margin_of_error)
+@lru_cache(maxsize=None)
+def cached_permutations(candidates: tuple, length: int) -> tuple:
+    # rankings repeat across tests, so enumerate each set once
+    return tuple(it.permutations(candidates, length))
 
-    return conf_interval
+
+def binomial_confidence_intervals(probabilities, n_attempts, alpha=0.99):
+    # exact central intervals of each binomial distribution at the alpha confidence level
+    return stats.binom.interval(alpha, n_attempts, probabilities)
 
 
 def do_ballot_probs_match_ballot_dist(
-    ballot_prob_dict: dict, generated_profile: PreferenceProfile, alpha=0.95
+    ballot_prob_dict: dict, generated_profile: PreferenceProfile, alpha=0.99
 ):
     n_ballots = generated_profile.num_ballots()
-    ballot_conf_dict = {
-        b: binomial_confidence_interval(p, n_attempts=int(n_ballots), alpha=alpha)
-        for b, p in ballot_prob_dict.items()
-    }
+    # every ranking's interval is widened so that a correct generator lands all of them in
+    # their intervals with probability at least alpha
+    lower, upper = binomial_confidence_intervals(
+        np.fromiter(ballot_prob_dict.values(), dtype=float),
+        n_attempts=int(n_ballots),
+        alpha=1 - (1 - alpha) / len(ballot_prob_dict),
+    )
 
-    failed = 0
-
-    for b in ballot_conf_dict.keys():
-        b_list = [{c} for c in b]
-        ballot = next(
-            (
-                element
-                for element in generated_profile.ballots
-                if element.ranking == b_list
-            ),
-            None,
+    # index the generated ballots by ranking for constant time lookups
+    ranking_to_weight: dict = {}
+    for ballot in generated_profile.ballots:
+        ranking_to_weight[ballot.ranking] = (
+            ranking_to_weight.get(ballot.ranking, 0) + ballot.weight
         )
-        ballot_weight = 0
-        if ballot is not None:
-            ballot_weight = ballot.weight
-        if not (
-            int(ballot_conf_dict[b][0]) <= ballot_weight <= int(ballot_conf_dict[b][1])
-        ):
-            failed += 1
+    expected_rankings = [tuple(frozenset({c}) for c in b) for b in ballot_prob_dict]
+    ballot_weights = np.array(
+        [float(ranking_to_weight.pop(r, 0)) for r in expected_rankings]
+    )
 
-    # allow for small margin of error given confidence intereval
-    failure_thresold = round((1 - alpha) * n_ballots)
-    return failed <= failure_thresold
+    # ballots with rankings that the distribution gives no probability are failures too
+    in_interval = (lower <= ballot_weights) & (ballot_weights <= upper)
+    return bool(in_interval.all()) and not ranking_to_weight
 
 
 def test_ic_distribution():
@@ -80,7 +82,7 @@ def test_ic_distribution():
     candidates = ["W1", "W2", "C1", "C2"]
 
     # Find ballot probs
-    possible_rankings = it.permutations(candidates, len(candidates))
+    possible_rankings = cached_permutations(tuple(candidates), len(candidates))
     ballot_prob_dict = {
         b: 1 / math.factorial(len(candidates)) for b in possible_rankings
     }
@@ -99,7 +101,7 @@ def test_ballot_simplex_from_point():
     candidates = ["W1", "W2", "C1", "C2"]
     pt = {"W1": 1 / 4, "W2": 1 / 4, "C1": 1 / 4, "C2": 1 / 4}
 
-    possible_rankings = it.permutations(candidates, len(candidates))
+    possible_rankings = cached_permutations(tuple(candidates), len(candidates))
     ballot_prob_dict = {
         b: 1 / math.factorial(len(candidates)) for b in possible_rankings
     }
@@ -112,25 +114,37 @@ def test_ballot_simplex_from_point():
 
 
 def test_iac_distribution():
-    number_of_ballots = 1000
-    ballot_length = 4
+    number_of_ballots = 100
+    number_of_profiles = 400
     candidates = ["W1", "W2", "C1", "C2"]
 
-    # Find ballot probs
-    possible_rankings = list(it.permutations(candidates, ballot_length))
-    probabilities = np.random.dirichlet([1] * len(possible_rankings))
+    possible_rankings = cached_permutations(tuple(candidates), len(candidates))
+    generator = ImpartialAnonymousCulture(candidates=candidates)
 
-    ballot_prob_dict = {
-        possible_rankings[b_ind]: probabilities[b_ind]
-        for b_ind in range(len(possible_rankings))
-    }
-    generated_profile = ImpartialAnonymousCulture(
-        number_of_ballots=number_of_ballots,
-        candidates=candidates,
-    ).generate_profile(number_of_ballots=500)
+    shares = np.zeros((number_of_profiles, len(possible_rankings)))
+    for k in range(number_of_profiles):
+        profile = generator.generate_profile(number_of_ballots=number_of_ballots)
+        ranking_to_weight = {
+            tuple(next(iter(s)) for s in b.ranking): float(b.weight)
+            for b in profile.ballots
+        }
+        shares[k] = [ranking_to_weight.get(r, 0) for r in possible_rankings]
+    shares /= number_of_ballots
 
-    # Test
-    assert do_ballot_probs_match_ballot_dist(ballot_prob_dict, generated_profile)
+    # each profile draws its ranking probabilities from a flat Dirichlet, so the share of a
+    # ranking has mean 1/m and variance Var(p) + E[p(1 - p)] / n, with p ~ Beta(1, m - 1)
+    m = len(possible_rankings)
+    mean = 1 / m
+    var_p = mean * (1 - mean) / (m + 1)
+    var_share = var_p + (mean - var_p - mean**2) / number_of_ballots
+
+    # every ranking is equally likely across profiles
+    tolerance = 5 * np.sqrt(var_share / number_of_profiles)
+    np.testing.assert_array_less(np.abs(shares.mean(axis=0) - mean), tolerance)
+
+    # shares vary between profiles as much as IAC predicts, which is about five times
+    # the variance that impartial culture would give
+    assert 0.85 < shares.var(axis=0, ddof=1).mean() / var_share < 1.15
 
 
 def test_NPL_distribution():
@@ -162,7 +176,7 @@ def test_NPL_distribution():
     generated_profile = pl.generate_profile(number_of_ballots=number_of_ballots)
 
     # Find ballot probs
-    possible_rankings = list(it.permutations(candidates, len(candidates)))
+    possible_rankings = cached_permutations(tuple(candidates), len(candidates))
     ballot_prob_dict = {b: 0 for b in possible_rankings}
 
     for ranking in possible_rankings:
@@ -210,21 +224,20 @@ def test_SPL_distribution():
     blocs = list(bloc_voter_prop.keys())
 
     # Find labeled ballot probs
-    possible_rankings = list(it.permutations(candidates))
+    possible_rankings = cached_permutations(tuple(candidates), len(candidates))
     for current_bloc in blocs:
         ballot_prob_dict = {b: 0 for b in possible_rankings}
 
         for ranking in possible_rankings:
-            support_for_cands = combine_preference_intervals(
-                list(pref_intervals_by_bloc[current_bloc].values()),
-                [1 / len(blocs) for _ in range(len(blocs))],
-            ).interval
-            # pref_interval_by_bloc[current_bloc]
-            total_prob = 1
+            # each slate's candidates are ordered by PL on that slate's own interval
             prob = 1
-            for cand in ranking:
-                prob *= support_for_cands[cand] / total_prob
-                total_prob -= support_for_cands[cand]
+            for slate_interval in pref_intervals_by_bloc[current_bloc].values():
+                support_for_cands = slate_interval.interval
+                total_prob = sum(support_for_cands.values())
+                for cand in ranking:
+                    if cand in support_for_cands:
+                        prob *= support_for_cands[cand] / total_prob
+                        total_prob -= support_for_cands[cand]
             ballot_prob_dict[ranking] += prob
 
         candidate_to_slate = {
@@ -290,27 +303,27 @@ def test_NBT_distribution():
     generated_profile = bt.generate_profile(number_of_ballots=number_of_ballots)
 
     # Find ballot probs
-    possible_rankings = list(it.permutations(candidates, len(candidates)))
+    possible_rankings = cached_permutations(tuple(candidates), len(candidates))
+    # row r holds the candidate indices of possible_rankings[r]
+    perms = np.array(
+        cached_permutations(tuple(range(len(candidates))), len(candidates))
+    )
+    # pairs (i, j) with i ranked above j
+    upper_i, upper_j = np.triu_indices(len(candidates), k=1)
 
-    final_ballot_prob_dict = {b: 0 for b in possible_rankings}
+    # entry r is the probability of possible_rankings[r]
+    final_probs = np.zeros(len(perms))
 
     for bloc in bloc_voter_prop.keys():
-        ballot_prob_dict = {b: 0 for b in possible_rankings}
-        for ranking in possible_rankings:
-            support_for_cands = bt.pref_interval_by_bloc[bloc].interval
-            prob = bloc_voter_prop[bloc]
-            for i in range(len(ranking)):
-                greater_cand = support_for_cands[ranking[i]]
-                for j in range(i + 1, len(ranking)):
-                    cand = support_for_cands[ranking[j]]
-                    prob *= greater_cand / (greater_cand + cand)
-            ballot_prob_dict[ranking] += prob
-        normalizer = 1 / sum(ballot_prob_dict.values())
-        ballot_prob_dict = {k: v * normalizer for k, v in ballot_prob_dict.items()}
-        final_ballot_prob_dict = {
-            k: v + bloc_voter_prop[bloc] * ballot_prob_dict[k]
-            for k, v in final_ballot_prob_dict.items()
-        }
+        support_for_cands = bt.pref_interval_by_bloc[bloc].interval
+        support = np.array([support_for_cands[c] for c in candidates])[perms]
+        greater_cand = support[:, upper_i]
+        cand = support[:, upper_j]
+        probs = np.prod(greater_cand / (greater_cand + cand), axis=1)
+        probs /= probs.sum()
+        final_probs += bloc_voter_prop[bloc] * probs
+
+    final_ballot_prob_dict = dict(zip(possible_rankings, final_probs))
 
     # Test
     assert do_ballot_probs_match_ballot_dist(final_ballot_prob_dict, generated_profile)
@@ -567,7 +580,7 @@ def test_AC_distribution():
     cohesion_parameters = {"W": 0.9, "C": 0}
 
     # Find ballot probs
-    possible_rankings = list(it.permutations(candidates, len(candidates)))
+    possible_rankings = cached_permutations(tuple(candidates), len(candidates))
     ballot_prob_dict = {b: 0 for b in possible_rankings}
 
     for ranking in possible_rankings:
@@ -626,14 +639,17 @@ def test_AC_distribution():
 
 
 def compute_pl_prob(perm, interval):
-    pref_interval = interval.copy()
+    # running total of the support left, and how many candidates still have support
+    total = sum(interval.values())
+    num_non_zero = sum(share > 0 for share in interval.values())
     prob = 1
-    for c in perm:
-        if sum(pref_interval.values()) == 0:
-            prob *= 1 / math.factorial(len(pref_interval))
+    for i, c in enumerate(perm):
+        if num_non_zero == 0:
+            prob *= 1 / math.factorial(len(interval) - i)
         else:
-            prob *= pref_interval[c] / sum(pref_interval.values())
-        del pref_interval[c]
+            prob *= interval[c] / total
+            total -= interval[c]
+            num_non_zero -= interval[c] > 0
     return prob
 
 
@@ -679,161 +695,67 @@ def test_Cambridge_distribution():
         path=path,
     )
 
-    candidates = ["W1", "W2", "C1", "C2"]
-    slate_to_candidate = {"W": ["W1", "W2"], "C": ["C1", "C2"]}
-    pref_interval_by_bloc = {
-        "W": {"W1": 0.4, "W2": 0.4, "C1": 0.1, "C2": 0.1},
-        "C": {"W1": 0.1, "W2": 0.1, "C1": 0.4, "C2": 0.4},
-    }
-    bloc_voter_prop = {"W": 0.5, "C": 0.5}
-    cohesion_parameters = {"W": 1, "C": 1}
-
     with open(path, "rb") as pickle_file:
         ballot_frequencies = pickle.load(pickle_file)
     slates = list(slate_to_candidate.keys())
+    opp_of = {s: next(x for x in slates if x != s) for s in slates}
+
+    ballot_prob_dict: dict = {}
+    for voter_bloc in slates:
+        opp_bloc = opp_of[voter_bloc]
+        cohesion = cohesion_parameters[voter_bloc][voter_bloc]
+
+        # voters rank candidates by PL on their bloc's combined interval, so the order within
+        # each slate is PL on that slate's shares, and candidates with no support are left off
+        combined = combine_preference_intervals(
+            [
+                pref_intervals_by_bloc[voter_bloc][voter_bloc],
+                pref_intervals_by_bloc[voter_bloc][opp_bloc],
+            ],
+            [cohesion, 1 - cohesion],
+        ).interval
+        slate_intervals = {
+            s: {c: combined[c] for c in slate_to_candidate[s] if c in combined}
+            for s in slates
+        }
 
-    # Let's update the running probability of the ballot based on where we are in the nesting
-    ballot_prob_dict = dict()
-    ballot_prob = [0, 0, 0, 0, 0]
-    # p(white) vs p(poc)
-    for slate in slates:
-        opp_slate = next(iter(set(slates).difference(set(slate))))
-
-        slate_cands = slate_to_candidate[slate]
-        opp_cands = slate_to_candidate[opp_slate]
-
-        ballot_prob[0] = bloc_voter_prop[slate]
-        prob_ballot_given_slate_first = bloc_order_probs_slate_first(
-            slate, ballot_frequencies
-        )
-        # p(crossover) vs p(non-crossover)
-        for voter_bloc in slates:
-            opp_voter_bloc = next(iter(set(slates).difference(set(voter_bloc))))
-            if voter_bloc == slate:
-                # ballot_prob[1] = 1 - bloc_crossover_rate[voter_bloc][opp_voter_bloc]
-                ballot_prob[1] = cohesion_parameters[voter_bloc]
-
-                # p(bloc ordering)
-                for (
-                    slate_first_ballot,
-                    slate_ballot_prob,
-                ) in prob_ballot_given_slate_first.items():
-                    ballot_prob[2] = slate_ballot_prob
-
-                    # Count number of each slate in the ballot
-                    slate_ballot_count_dict = {}
-                    for s, sc in slate_to_candidate.items():
-                        count = sum([c == s for c in slate_first_ballot])
-                        slate_ballot_count_dict[s] = min(count, len(sc))
-
-                    # Make all possible perms with right number of slate candidates
-                    slate_perms = list(
-                        set(
-                            [
-                                p[: slate_ballot_count_dict[slate]]
-                                for p in list(it.permutations(slate_cands))
-                            ]
-                        )
+        # bloc voters draw their slate ordering from historical ballots that start with their
+        # own slate, and crossover voters from those that start with the other slate
+        for first_slate, voter_share in [
+            (voter_bloc, cohesion),
+            (opp_bloc, 1 - cohesion),
+        ]:
+            share = bloc_voter_prop[voter_bloc] * voter_share
+            if share == 0:
+                continue
+
+            slate_orders = bloc_order_probs_slate_first(first_slate, ballot_frequencies)
+            for slate_order, order_prob in slate_orders.items():
+                # each slate fills as many of its slots as it has candidates with support
+                perms_by_slate = [
+                    cached_permutations(
+                        tuple(slate_intervals[s]),
+                        min(slate_order.count(s), len(slate_intervals[s])),
                     )
-                    opp_perms = list(
-                        set(
-                            [
-                                p[: slate_ballot_count_dict[opp_slate]]
-                                for p in list(it.permutations(opp_cands))
-                            ]
+                    for s in slates
+                ]
+                for perms in it.product(*perms_by_slate):
+                    prob = (
+                        share
+                        * order_prob
+                        * math.prod(
+                            compute_pl_prob(perm, slate_intervals[s])
+                            for s, perm in zip(slates, perms)
                         )
                     )
-
-                    only_slate_interval = {
-                        c: share
-                        for c, share in pref_interval_by_bloc[voter_bloc].items()
-                        if c in slate_cands
-                    }
-                    only_opp_interval = {
-                        c: share
-                        for c, share in pref_interval_by_bloc[voter_bloc].items()
-                        if c in opp_cands
-                    }
-                    for sp in slate_perms:
-                        ballot_prob[3] = compute_pl_prob(sp, only_slate_interval)
-                        for op in opp_perms:
-                            ballot_prob[4] = compute_pl_prob(op, only_opp_interval)
-
-                            # ADD PROB MULT TO DICT
-                            ordered_slate_cands = list(sp)
-                            ordered_opp_cands = list(op)
-                            ballot_ranking = []
-                            for c in slate_first_ballot:
-                                if c == slate:
-                                    if ordered_slate_cands:
-                                        ballot_ranking.append(
-                                            ordered_slate_cands.pop(0)
-                                        )
-                                else:
-                                    if ordered_opp_cands:
-                                        ballot_ranking.append(ordered_opp_cands.pop(0))
-                            prob = np.prod(ballot_prob)
-                            ballot = tuple(ballot_ranking)
-                            ballot_prob_dict[ballot] = (
-                                ballot_prob_dict.get(ballot, 0) + prob
-                            )
-            else:
-                # ballot_prob[1] = bloc_crossover_rate[voter_bloc][opp_voter_bloc]
-                ballot_prob[1] = 1 - cohesion_parameters[voter_bloc]
-
-                # p(bloc ordering)
-                for (
-                    slate_first_ballot,
-                    slate_ballot_prob,
-                ) in prob_ballot_given_slate_first.items():
-                    ballot_prob[2] = slate_ballot_prob
-
-                    # Count number of each slate in the ballot
-                    slate_ballot_count_dict = {}
-                    for s, sc in slate_to_candidate.items():
-                        count = sum([c == s for c in slate_first_ballot])
-                        slate_ballot_count_dict[s] = min(count, len(sc))
-
-                    # Make all possible perms with right number of slate candidates
-                    slate_perms = [
-                        p[: slate_ballot_count_dict[slate]]
-                        for p in list(it.permutations(slate_cands))
-                    ]
-                    opp_perms = [
-                        p[: slate_ballot_count_dict[opp_slate]]
-                        for p in list(it.permutations(opp_cands))
-                    ]
-                    only_slate_interval = {
-                        c: share
-                        for c, share in pref_interval_by_bloc[opp_voter_bloc].items()
-                        if c in slate_cands
-                    }
-                    only_opp_interval = {
-                        c: share
-                        for c, share in pref_interval_by_bloc[opp_voter_bloc].items()
-                        if c in opp_cands
-                    }
-                    for sp in slate_perms:
-                        ballot_prob[3] = compute_pl_prob(sp, only_slate_interval)
-                        for op in opp_perms:
-                            ballot_prob[4] = compute_pl_prob(op, only_opp_interval)
-
-                            # ADD PROB MULT TO DICT
-                            ordered_slate_cands = list(sp)
-                            ordered_opp_cands = list(op)
-                            ballot_ranking = []
-                            for c in slate_first_ballot:
-                                if c == slate:
-                                    if ordered_slate_cands:
-                                        ballot_ranking.append(ordered_slate_cands.pop())
-                                else:
-                                    if ordered_opp_cands:
-                                        ballot_ranking.append(ordered_opp_cands.pop())
-                            prob = np.prod(ballot_prob)
-                            ballot = tuple(ballot_ranking)
-                            ballot_prob_dict[ballot] = (
-                                ballot_prob_dict.get(ballot, 0) + prob
-                            )
+                    cursors = {s: iter(perm) for s, perm in zip(slates, perms)}
+                    ballot = tuple(
+                        c
+                        for s in slate_order
+                        for c in [next(cursors[s], None)]
+                        if c is not None
+                    )
+                    ballot_prob_dict[ballot] = ballot_prob_dict.get(ballot, 0) + prob
 
     # Now see if ballot prob dict is right
     test_profile = cs.generate_profile(number_of_ballots=5000)
@@ -855,12 +777,13 @@ def test_sample_ballot_types():
     ballots = [Ballot([{c} for c in b]) for b in sampled]
     pp = PreferenceProfile(ballots=ballots)
 
+    # once a slate is exhausted it is dropped and the remaining cohesion renormalized,
+    # so after AA the ballot must end in B
     ballot_prob_dict = {
         "AAB": cohesion_parameters_for_A_bloc["A"] ** 2,
         "ABA": cohesion_parameters_for_A_bloc["A"]
         * cohesion_parameters_for_A_bloc["B"],
-        "BAA": cohesion_parameters_for_A_bloc["A"]
-        * cohesion_parameters_for_A_bloc["B"],
+        "BAA": cohesion_parameters_for_A_bloc["B"],
     }
     # Test
     assert do_ballot_probs_match_ballot_dist(ballot_prob_dict, pp)
@@ -877,24 +800,49 @@ def test_sample_ballot_types():
     ballots = [Ballot([{c} for c in b]) for b in sampled]
     pp = PreferenceProfile(ballots=ballots)
 
+    # each slate holds one candidate, so the blocs are drawn without replacement
     ballot_prob_dict = {
-        "ABC": cohesion_parameters_for_A_bloc["A"]
-        * cohesion_parameters_for_A_bloc["B"],
-        "ACB": cohesion_parameters_for_A_bloc["A"]
-        * cohesion_parameters_for_A_bloc["C"],
-        "BAC": cohesion_parameters_for_A_bloc["B"]
-        * cohesion_parameters_for_A_bloc["A"],
-        "BCA": cohesion_parameters_for_A_bloc["B"]
-        * cohesion_parameters_for_A_bloc["C"],
-        "CAB": cohesion_parameters_for_A_bloc["C"]
-        * cohesion_parameters_for_A_bloc["A"],
-        "CBA": cohesion_parameters_for_A_bloc["C"]
-        * cohesion_parameters_for_A_bloc["B"],
+        "".join(b): cohesion_parameters_for_A_bloc[b[0]]
+        * cohesion_parameters_for_A_bloc[b[1]]
+        / (1 - cohesion_parameters_for_A_bloc[b[0]])
+        for b in it.permutations("ABC")
     }
     # Test
     assert do_ballot_probs_match_ballot_dist(ballot_prob_dict, pp)
 
 
+def test_sample_pl_rankings():
+    support = np.array([0.5, 0.3, 0.2, 0.0])
+    num_ballots = 20_000
+
+    sampled = sample_pl_rankings(support, num_ballots=num_ballots, ranking_length=2)
+    assert sampled.shape == (num_ballots, 2)
+
+    rankings = list(it.permutations(range(len(support)), 2))
+    probs = np.array([support[i] * support[j] / (1 - support[i]) for i, j in rankings])
+    counts = Counter(map(tuple, sampled.tolist()))
+    freqs = np.array([counts[r] for r in rankings]) / num_ballots
+
+    # every ranking's frequency is within four binomial standard deviations of its PL
+    # probability, and rankings with zero probability are never drawn
+    tolerance = 4 * np.sqrt(probs * (1 - probs) / num_ballots)
+    np.testing.assert_array_less(np.abs(freqs - probs), tolerance + 1e-12)
+    assert sum(counts.values()) == num_ballots
+
+
+def test_sample_pl_rankings_zero_support_tail():
+    support = np.array([0.6, 0.0, 0.4, 0.0])
+    num_ballots = 20_000
+
+    sampled = sample_pl_rankings(support, num_ballots=num_ballots, ranking_length=4)
+
+    # the candidates with support fill the top of every ranking, and the candidates with
+    # no support follow in a uniformly random order
+    assert (np.sort(sampled[:, :2], axis=1) == [0, 2]).all()
+    share = np.mean(sampled[:, 2] == 1)
+    assert abs(share - 0.5) < 4 * np.sqrt(0.25 / num_ballots)
+
+
 def test_zero_cohesion_sample_ballot_types():
     slate_to_non_zero_candidates = {"A": ["A1", "A2"], "B": ["B1", "B2"]}
     cohesion_parameters_for_A_bloc = {"A": 1, "B": 0}
@@ -959,21 +907,23 @@ def test_slate_BT_distribution():
 
     pp = sbt.generate_profile(number_of_ballots=100)
 
+    # ballot types are weighted by the cohesion of every pairwise slate comparison,
+    # then each slate is ordered by its preference interval
+    cohesion = sbt.cohesion_parameters["A"]["A"]
+    type_weights = {
+        "AAB": cohesion**2,
+        "ABA": cohesion * (1 - cohesion),
+        "BAA": (1 - cohesion) ** 2,
+    }
+    total_weight = sum(type_weights.values())
+    interval = sbt.pref_intervals_by_bloc["A"]["A"].interval
     ballot_prob_dict = {
-        "XYZ": sbt.cohesion_parameters["A"]["A"] ** 2
-        * sbt.pref_intervals_by_bloc["A"]["A"].interval["X"],
-        "YXZ": sbt.cohesion_parameters["A"]["A"] ** 2
-        * sbt.pref_intervals_by_bloc["A"]["A"].interval["Y"],
-        "XZY": sbt.cohesion_parameters["A"]["A"]
-        * sbt.cohesion_parameters["A"]["B"]
-        * sbt.pref_intervals_by_bloc["A"]["A"].interval["X"],
-        "YZX": sbt.cohesion_parameters["A"]["A"]
-        * sbt.cohesion_parameters["A"]["B"]
-        * sbt.pref_intervals_by_bloc["A"]["A"].interval["Y"],
-        "ZXY": sbt.cohesion_parameters["A"]["B"] ** 2
-        * sbt.pref_intervals_by_bloc["A"]["A"].interval["X"],
-        "ZYX": sbt.cohesion_parameters["A"]["B"] ** 2
-        * sbt.pref_intervals_by_bloc["A"]["A"].interval["X"],
+        "XYZ": type_weights["AAB"] / total_weight * interval["X"],
+        "YXZ": type_weights["AAB"] / total_weight * interval["Y"],
+        "XZY": type_weights["ABA"] / total_weight * interval["X"],
+        "YZX": type_weights["ABA"] / total_weight * interval["Y"],
+        "ZXY": type_weights["BAA"] / total_weight * interval["X"],
+        "ZYX": type_weights["BAA"] / total_weight * interval["Y"],
     }
 
     # Test
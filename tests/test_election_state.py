@@ -86,6 +86,25 @@ def test_changed_rankings():
     assert rounds[1].changed_rankings() == {"C": (0, 2)}
 
 
+def test_changed_rankings_new_candidate():
+    first = ElectionState(
+        curr_round=1,
+        elected=[{"A"}],
+        remaining=[{"B"}],
+        profile=MagicMock(spec=PreferenceProfile),
+    )
+    second = ElectionState(
+        curr_round=2,
+        elected=[{"C"}],
+        remaining=[{"B"}],
+        profile=MagicMock(spec=PreferenceProfile),
+        previous=first,
+    )
+
+    with pytest.raises(KeyError):
+        second.changed_rankings()
+
+
 def test_get_all_winners():
     first = ElectionState(
         curr_round=1,
@@ -195,6 +214,34 @@ def test_ranking_no_remaining():
     assert rank == [{"A"}, {"B"}, {"D"}, {"E"}, {"C"}]
 
 
+def test_caller_lists_are_copied():
+    elected = [{"A"}]
+    eliminated = [{"C"}]
+    remaining = [{"B"}]
+    scores = {"A": 3, "B": 2}
+    state = ElectionState(
+        curr_round=1,
+        elected=elected,
+        eliminated_cands=eliminated,
+        remaining=remaining,
+        scores=scores,
+        profile=MagicMock(spec=PreferenceProfile),
+    )
+    elected.append({"B"})
+    elected[0].add("D")
+    eliminated[0].add("E")
+    eliminated.clear()
+    remaining[0].add("F")
+    remaining.clear()
+    scores["B"] = 5
+
+    assert state.elected == [{"A"}]
+    assert state.eliminated_cands == [{"C"}]
+    assert state.remaining == [{"B"}]
+    assert state.scores == {"A": 3, "B": 2}
+    assert state.rankings() == [{"A"}, {"B"}, {"C"}]
+
+
 def test_ranking_w_remaing():
     first = ElectionState(
         curr_round=1,
@@ -374,6 +421,29 @@ def test_get_scores():
     assert second.get_scores(1) == {"A": 4, "B": 6, "F": 3, "C": 9}
 
 
+def test_get_scores_earlier_round():
+    first = ElectionState(
+        curr_round=1,
+        scores={"A": 4, "B": 6},
+        profile=MagicMock(spec=PreferenceProfile),
+    )
+    second = ElectionState(
+        curr_round=2,
+        scores={"A": 5},
+        profile=MagicMock(spec=PreferenceProfile),
+        previous=first,
+    )
+    third = ElectionState(
+        curr_round=3,
+        scores={"A": 7},
+        profile=MagicMock(spec=PreferenceProfile),
+        previous=second,
+    )
+
+    assert third.get_scores(1) == {"A": 4, "B": 6}
+    assert third.get_scores() == {"A": 7}
+
+
 def test_score_error():
     first = ElectionState(
         curr_round=1,
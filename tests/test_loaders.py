@@ -1,8 +1,20 @@
+from collections import Counter
 from fractions import Fraction
-from pandas.errors import EmptyDataError, DataError
+from functools import lru_cache
+import importlib.util
+import io
+import os
+import pandas as pd
+from pandas.errors import EmptyDataError, DataError, ParserError, ParserWarning
 from pathlib import Path
+import numpy as np
+import pickle
 import pytest
+import random
+import tracemalloc
+from typing import Sequence
 
+from votekit import ballot, cvr_loaders, pref_profile
 from votekit.ballot import Ballot
 from votekit.cvr_loaders import load_csv, load_scottish
 from votekit.pref_profile import PreferenceProfile
@@ -10,148 +22,536 @@ from votekit.pref_profile import PreferenceProfile
 
 BASE_DIR = Path(__file__).resolve().parent
 CSV_DIR = BASE_DIR / "data/csv/"
+# set VOTEKIT_FIXTURE_CACHE=1 to keep the parsed csv files on disk between runs
+FIXTURE_CACHE = os.environ.get("VOTEKIT_FIXTURE_CACHE") == "1"
+FIXTURE_CACHE_DIR = CSV_DIR / ".cache"
+ONE, TWO, THREE = Fraction(1), Fraction(2), Fraction(3)
+# benchmarks are skipped by default, and need the pytest-benchmark dev dependency; run, save
+# and compare them with pytest --benchmark-only --benchmark-autosave and --benchmark-compare
+needs_pyarrow = pytest.mark.skipif(
+    importlib.util.find_spec("pyarrow") is None, reason="pyarrow is not installed"
+)
+ENGINES = ["c", pytest.param("pyarrow", marks=needs_pyarrow)]
+ALL_ENGINES = ["c", "python", pytest.param("pyarrow", marks=needs_pyarrow)]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def warm_csv_parser():
+    # pay pandas' one-off parser setup before the first test, so it is not timed as part of it
+    pd.read_csv(io.StringIO("a,b\n1,2"))
+
+
+@lru_cache(maxsize=None)
+def csv_path(fname: str) -> Path:
+    return CSV_DIR / fname
+
+
+@pytest.fixture(scope="module")
+def csv_cache():
+    return {}
+
+
+def cached_load_csv(
+    cache: dict, fpath: Path, id_col=None, engine="c"
+) -> PreferenceProfile:
+    # the csv files are static, so parse each one at most once per test run
+    key = (str(fpath), id_col, engine)
+    if key not in cache:
+        if FIXTURE_CACHE:
+            cache[key] = load_fixture(fpath, id_col=id_col, engine=engine)
+        else:
+            cache[key] = load_csv(fpath, id_col=id_col, engine=engine)
+    return cache[key]
+
+
+def load_fixture(fpath: Path, id_col=None, engine="c") -> PreferenceProfile:
+    # the pickle is stale once the csv, the loader or the pickled classes change
+    pkl_path = FIXTURE_CACHE_DIR / f"{fpath.name}.{id_col}.{engine}.pkl"
+    newest = max(
+        Path(f).stat().st_mtime
+        for f in (fpath, cvr_loaders.__file__, ballot.__file__, pref_profile.__file__)
+    )
+    if pkl_path.exists() and pkl_path.stat().st_mtime >= newest:
+        with open(pkl_path, "rb") as f:
+            return pickle.load(f)
+
+    prof = load_csv(fpath, id_col=id_col, engine=engine)
+    FIXTURE_CACHE_DIR.mkdir(exist_ok=True)
+    # write then rename, so parallel workers never read a partial pickle
+    tmp_path = pkl_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(prof, f)
+    os.replace(tmp_path, pkl_path)
+    return prof
+
+
+@pytest.fixture(scope="module")
+def scot_cache():
+    return {}
+
 
+def cached_load_scottish(cache: dict, fpath: Path) -> tuple:
+    # the error tests call load_scottish directly, since a failed parse is never cached
+    key = str(fpath)
+    if key not in cache:
+        cache[key] = load_scottish(fpath)
+    return cache[key]
 
-def is_equal(b1: list[Ballot], b2: list[Ballot]) -> bool:
+
+def ballot_key(b: Ballot) -> tuple:
+    # hashable stand-in for a ballot, since voter_set is a mutable set
+    voters = frozenset(b.voter_set) if b.voter_set is not None else None
+    return (b.ranking, b.weight, voters, b.id)
+
+
+def is_equal(b1: Sequence[Ballot], b2: Sequence[Ballot]) -> bool:
+    # count the ballots of b1, then cross them off with b2, stopping at the first mismatch
     if len(b1) != len(b2):
         return False
-    for b in b1:
-        if b not in b2:
+    counts = Counter(map(ballot_key, b1))
+    for key in map(ballot_key, b2):
+        if not counts[key]:
             return False
+        counts[key] -= 1
     return True
 
 
-def test_empty_csv():
-    with pytest.raises(EmptyDataError):
-        load_csv(CSV_DIR / "empty.csv", id_col=0)
+def ballot_array(
+    ballots: Sequence[Ballot], cand_map: dict, num_ranks: int
+) -> np.ndarray:
+    # one row per ballot of its candidate codes by rank, padded with -1, and its weight, as
+    # a sorted structured array; ballots must be untied and carry no voter sets
+    dtype = [(f"r{i}", "i2") for i in range(num_ranks)] + [("wn", "i8"), ("wd", "i8")]
+    arr = np.zeros(len(ballots), dtype=dtype)
+    for i in range(num_ranks):
+        arr[f"r{i}"] = [
+            cand_map[next(iter(b.ranking[i]))] if i < len(b.ranking) else -1
+            for b in ballots
+        ]
+    arr["wn"] = [b.weight.numerator for b in ballots]
+    arr["wd"] = [b.weight.denominator for b in ballots]
+    return np.sort(arr)
+
+
+def is_equal_array(b1: Sequence[Ballot], b2: Sequence[Ballot]) -> bool:
+    # vectorized is_equal for long lists of untied ballots without voter sets
+    cands = {c for b in (*b1, *b2) for s in b.ranking for c in s}
+    cand_map = {c: i for i, c in enumerate(sorted(cands, key=str))}
+    num_ranks = max((len(b.ranking) for b in (*b1, *b2)), default=0)
+    return np.array_equal(
+        ballot_array(b1, cand_map, num_ranks), ballot_array(b2, cand_map, num_ranks)
+    )
 
 
-def test_undervote():
-    prof = load_csv(CSV_DIR / "undervote.csv", id_col=0)
-    a = Ballot(
-        id=None, ranking=[{"c"}, {None}, {None}], weight=Fraction(1), voter_set={"a"}
-    )
-    correct_prof = PreferenceProfile(ballots=[a])
-    assert correct_prof.ballots == prof.ballots
-    # assert correct_prof.ballots[0].ranking == prof.ballots[0].ranking
+@pytest.mark.parametrize("engine", ENGINES)
+def test_empty_csv(engine):
+    with pytest.raises(EmptyDataError, match="Dataset cannot be empty"):
+        load_csv(csv_path("empty.csv"), id_col=0, engine=engine)
 
 
-def test_only_cols():
-    with pytest.raises(EmptyDataError):
-        load_csv(CSV_DIR / "only_cols.csv", id_col=0)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_only_cols(engine):
+    with pytest.raises(EmptyDataError, match="Dataset cannot be empty"):
+        load_csv(csv_path("only_cols.csv"), id_col=0, engine=engine)
 
 
 def test_invalid_path():
-    with pytest.raises(FileNotFoundError):
+    with pytest.raises(FileNotFoundError, match="cannot be found"):
         load_csv("fake_path.csv", id_col=0)
 
 
-def test_duplicates_candidates():
-    prof = load_csv(CSV_DIR / "dup_cands.csv", id_col=0)
-    # assert len(prof.ballots) == 3
-    abe = Ballot(ranking=[{"b"}, {"c"}, {"c"}], weight=Fraction(1), voter_set={"abe"})
-    don = Ballot(ranking=[{"a"}, {"c"}, {"c"}], weight=Fraction(1), voter_set={"don"})
-    carrie = Ballot(
-        ranking=[{"c"}, {"c"}, {"c"}], weight=Fraction(1), voter_set={"carrie"}
+# expected ballots are built once at import and shared by every run of the test, and
+# ballots expected from more than one file are the same object
+ABE_BCC = Ballot(
+    ranking=(frozenset({"b"}), frozenset({"c"}), frozenset({"c"})),
+    weight=ONE,
+    voter_set={"abe"},
+)
+ABE_ABC = Ballot(
+    ranking=(frozenset({"a"}), frozenset({"b"}), frozenset({"c"})),
+    weight=ONE,
+    voter_set={"abe"},
+)
+CSV_CASES = [
+    (
+        "undervote.csv",
+        (
+            Ballot(
+                id=None,
+                ranking=(frozenset({"c"}), frozenset({None}), frozenset({None})),
+                weight=ONE,
+                voter_set={"a"},
+            ),
+        ),
+    ),
+    (
+        "dup_cands.csv",
+        (
+            ABE_BCC,
+            Ballot(
+                ranking=(frozenset({"a"}), frozenset({"c"}), frozenset({"c"})),
+                weight=ONE,
+                voter_set={"don"},
+            ),
+            Ballot(
+                ranking=(frozenset({"c"}), frozenset({"c"}), frozenset({"c"})),
+                weight=ONE,
+                voter_set={"carrie"},
+            ),
+        ),
+    ),
+    (
+        "single_row.csv",
+        (
+            Ballot(
+                ranking=(frozenset({"b"}), frozenset({"c"}), frozenset({"d"})),
+                weight=ONE,
+                voter_set={"a"},
+            ),
+        ),
+    ),
+    (
+        "mult_undervote.csv",
+        (
+            Ballot(
+                ranking=(frozenset({"c"}), frozenset({None}), frozenset({None})),
+                weight=THREE,
+                voter_set={"abe", "ben", "carl"},
+            ),
+            Ballot(
+                ranking=(frozenset({None}), frozenset({"a"}), frozenset({None})),
+                weight=ONE,
+                voter_set={"dave"},
+            ),
+        ),
+    ),
+    (
+        "diff_undervote.csv",
+        (
+            Ballot(
+                ranking=(frozenset({"c"}), frozenset({None}), frozenset({"b"})),
+                weight=ONE,
+                voter_set={"a"},
+            ),
+            Ballot(
+                ranking=(frozenset({None}), frozenset({"d"}), frozenset({None})),
+                weight=ONE,
+                voter_set={"b"},
+            ),
+            Ballot(
+                ranking=(frozenset({"e"}), frozenset({None}), frozenset({"e"})),
+                weight=ONE,
+                voter_set={"c"},
+            ),
+        ),
+    ),
+    (
+        "dup_ballots.csv",
+        (
+            ABE_BCC,
+            Ballot(
+                ranking=(frozenset({"c"}), frozenset({"c"}), frozenset({"c"})),
+                weight=TWO,
+                voter_set={"don", "carrie"},
+            ),
+        ),
+    ),
+    (
+        "combo.csv",
+        (
+            Ballot(
+                ranking=(frozenset({"b"}), frozenset({"c"}), frozenset({"c"})),
+                weight=THREE,
+                voter_set={"abe", "ben", "carrie"},
+            ),
+            Ballot(
+                ranking=(frozenset({"c"}), frozenset({None}), frozenset({None})),
+                weight=TWO,
+                voter_set={"don", "ed"},
+            ),
+        ),
+    ),
+    (
+        "diff_cands.csv",
+        (
+            ABE_ABC,
+            Ballot(
+                ranking=(frozenset({"d"}), frozenset({"e"}), frozenset({"f"})),
+                weight=ONE,
+                voter_set={"don"},
+            ),
+            Ballot(
+                ranking=(frozenset({"g"}), frozenset({"h"}), frozenset({"i"})),
+                weight=ONE,
+                voter_set={"carrie"},
+            ),
+        ),
+    ),
+    (
+        "same_cands.csv",
+        (
+            ABE_ABC,
+            Ballot(
+                ranking=(frozenset({"c"}), frozenset({"b"}), frozenset({"a"})),
+                weight=ONE,
+                voter_set={"don"},
+            ),
+            Ballot(
+                ranking=(frozenset({"a"}), frozenset({"c"}), frozenset({"b"})),
+                weight=ONE,
+                voter_set={"carrie"},
+            ),
+        ),
+    ),
+    (
+        "special_char.csv",
+        (
+            Ballot(
+                ranking=(frozenset({"b@#"}), frozenset({"@#$"}), frozenset({"c"})),
+                weight=TWO,
+                voter_set={"a@#", "1@#"},
+            ),
+            Ballot(
+                ranking=(frozenset({"!23"}), frozenset({"c"}), frozenset({"c"})),
+                weight=ONE,
+                voter_set={"d#$"},
+            ),
+        ),
+    ),
+]
+CSV_NAMES = [fname for fname, _ in CSV_CASES]
+# ballots can repeat, so each file maps to the multiset of its expected ballot keys
+EXPECTED_KEYS = {
+    fname: Counter(map(ballot_key, expected)) for fname, expected in CSV_CASES
+}
+
+
+@pytest.fixture
+def csv_case(request):
+    # parametrized indirectly by file name, and returns its path and expected ballot keys
+    fname = request.param
+    return csv_path(fname), EXPECTED_KEYS[fname]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("csv_case", CSV_NAMES, indirect=True)
+def test_load_csv(csv_cache, csv_case, engine):
+    fpath, expected_keys = csv_case
+    prof = cached_load_csv(csv_cache, fpath, id_col=0, engine=engine)
+    assert Counter(map(ballot_key, prof.ballots)) == expected_keys
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_unnamed_ballot(engine):
+    with pytest.raises(ValueError, match="Missing value"):
+        load_csv(csv_path("unnamed.csv"), id_col=0, engine=engine)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_same_name(engine):
+    with pytest.raises(DataError, match="Duplicate value"):
+        load_csv(csv_path("same_name.csv"), id_col=0, engine=engine)
+
+
+@pytest.mark.parametrize("chunksize", [1, 2])
+@pytest.mark.parametrize("csv_case", CSV_NAMES, indirect=True)
+def test_load_csv_chunked(csv_case, chunksize):
+    fpath, expected_keys = csv_case
+    prof = load_csv(fpath, id_col=0, chunksize=chunksize)
+    assert Counter(map(ballot_key, prof.ballots)) == expected_keys
+
+
+def test_chunked_duplicate_ids():
+    # the duplicate ids of same_name.csv land in different chunks
+    with pytest.raises(DataError, match="Duplicate value"):
+        load_csv(csv_path("same_name.csv"), id_col=0, chunksize=1)
+
+
+@pytest.mark.parametrize("chunksize", [1, 2])
+def test_chunked_numeric_candidates(tmp_path, chunksize):
+    # numeric-looking candidates keep one type however the rows are split into chunks
+    fpath = tmp_path / "numeric.csv"
+    fpath.write_text("name,1,2\na,1,2\nb,1,\nc,x,1\nd,1,2\n")
+    whole = load_csv(fpath, id_col=0)
+    chunked = load_csv(fpath, id_col=0, chunksize=chunksize)
+    assert Counter(map(ballot_key, chunked.ballots)) == Counter(
+        map(ballot_key, whole.ballots)
+    )
+    assert Ballot(ranking=[{"1"}, {"2"}], weight=TWO, voter_set={"a", "d"}) in list(
+        whole.ballots
     )
-    correct_prof = PreferenceProfile(ballots=[abe, don, carrie])
-    assert is_equal(prof.ballots, correct_prof.ballots)
 
 
-def test_single_row():
-    prof = load_csv(CSV_DIR / "single_row.csv", id_col=0)
-    a = Ballot(ranking=[{"b"}, {"c"}, {"d"}], weight=Fraction(1), voter_set={"a"})
-    correct_prof = PreferenceProfile(ballots=[a])
-    assert is_equal(prof.ballots, correct_prof.ballots)
+def test_chunked_pyarrow():
+    with pytest.raises(ValueError, match="cannot read a file in chunks"):
+        load_csv(csv_path("combo.csv"), id_col=0, engine="pyarrow", chunksize=1)
 
 
-def test_multiple_undervotes():
-    prof = load_csv(CSV_DIR / "mult_undervote.csv", id_col=0)
-    abc = Ballot(
-        ranking=[{"c"}, {None}, {None}],
-        weight=Fraction(3),
-        voter_set={"abe", "ben", "carl"},
+def test_load_large_csv(tmp_path):
+    rows = ["b,c,a", "c,,", "a,b,c", "c,a,b"]
+    num_rows = 100_000
+    fpath = tmp_path / "big.csv"
+    fpath.write_text(
+        "1,2,3\n" + "\n".join(rows[i % len(rows)] for i in range(num_rows)) + "\n"
     )
-    dave = Ballot(
-        ranking=[{None}, {"a"}, {None}], weight=Fraction(1), voter_set={"dave"}
+
+    peaks = {}
+    profs = {}
+    for chunksize in [None, 10_000]:
+        tracemalloc.start()
+        profs[chunksize] = load_csv(fpath, chunksize=chunksize)
+        peaks[chunksize] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    assert is_equal_array(profs[None].ballots, profs[10_000].ballots)
+    assert profs[10_000].num_ballots() == num_rows
+    assert len(profs[10_000].ballots) == len(rows)
+    # only one chunk of rows is held in memory at a time
+    assert peaks[10_000] < peaks[None] / 2
+
+
+def test_multi_char_delimiter(tmp_path):
+    # pandas reads multi-character delimiters with its python engine
+    fpath = tmp_path / "colons.csv"
+    fpath.write_text("name::1::2::3\na::c::::\n")
+    with pytest.warns(ParserWarning, match="python"):
+        prof = load_csv(fpath, id_col=0, delimiter="::")
+    assert Counter(map(ballot_key, prof.ballots)) == EXPECTED_KEYS["undervote.csv"]
+
+
+@pytest.mark.filterwarnings("ignore:Falling back to the 'c' engine")
+@pytest.mark.parametrize("engine", ALL_ENGINES)
+def test_trailing_delimiter(engine):
+    # the empty cell after a trailing delimiter is dropped
+    prof = load_csv(io.StringIO("name,1,2\na,x,y,\n"), id_col=0, engine=engine)
+    assert [b.ranking for b in prof.ballots] == [(frozenset({"x"}), frozenset({"y"}))]
+
+
+@pytest.mark.filterwarnings("ignore:Falling back to the 'c' engine")
+@pytest.mark.parametrize("engine", ALL_ENGINES)
+def test_short_row(engine):
+    # the cells missing from a short row are read as empty
+    prof = load_csv(
+        io.StringIO("name,1,2,3\na,x,y\nb,x,y,z\n"), id_col=0, engine=engine
     )
-    correct_prof = PreferenceProfile(ballots=[abc, dave])
-    assert is_equal(correct_prof.ballots, prof.ballots)
+    expected = [
+        Ballot(ranking=[{"x"}, {"y"}, {None}], weight=ONE, voter_set={"a"}),
+        Ballot(ranking=[{"x"}, {"y"}, {"z"}], weight=ONE, voter_set={"b"}),
+    ]
+    assert Counter(map(ballot_key, prof.ballots)) == Counter(map(ballot_key, expected))
 
 
-def test_different_undervotes():
-    prof = load_csv(CSV_DIR / "diff_undervote.csv", id_col=0)
-    a = Ballot(ranking=[{"c"}, {None}, {"b"}], weight=Fraction(1), voter_set={"a"})
-    b = Ballot(ranking=[{None}, {"d"}, {None}], weight=Fraction(1), voter_set={"b"})
-    c = Ballot(ranking=[{"e"}, {None}, {"e"}], weight=Fraction(1), voter_set={"c"})
-    correct_prof = PreferenceProfile(ballots=[a, b, c])
-    assert is_equal(correct_prof.ballots, prof.ballots)
+@needs_pyarrow
+def test_short_row_pyarrow_falls_back():
+    with pytest.warns(ParserWarning, match="Falling back to the 'c' engine"):
+        load_csv(io.StringIO("name,1,2\na,x\n"), id_col=0, engine="pyarrow")
 
 
-def test_duplicate_ballots():
-    prof = load_csv(CSV_DIR / "dup_ballots.csv", id_col=0)
-    a = Ballot(ranking=[{"b"}, {"c"}, {"c"}], weight=Fraction(1), voter_set={"abe"})
-    dc = Ballot(
-        ranking=[{"c"}, {"c"}, {"c"}], weight=Fraction(2), voter_set={"don", "carrie"}
-    )
-    correct_prof = PreferenceProfile(ballots=[a, dc])
-    assert is_equal(correct_prof.ballots, prof.ballots)
+class UnseekableStringIO(io.StringIO):
+    def seekable(self):
+        return False
 
 
-def test_combo():
-    prof = load_csv(CSV_DIR / "combo.csv", id_col=0)
-    abc = Ballot(
-        ranking=[{"b"}, {"c"}, {"c"}],
-        weight=Fraction(3),
-        voter_set={"abe", "ben", "carrie"},
-    )
-    de = Ballot(
-        ranking=[{"c"}, {None}, {None}], weight=Fraction(2), voter_set={"don", "ed"}
-    )
-    correct_prof = PreferenceProfile(ballots=[abc, de])
-    assert is_equal(correct_prof.ballots, prof.ballots)
+@needs_pyarrow
+def test_short_row_pyarrow_unseekable():
+    # a stream that cannot be rewound cannot be read again by the c engine
+    with pytest.raises(ParserError, match="Expected 3 columns"):
+        load_csv(UnseekableStringIO("name,1,2\na,x\n"), id_col=0, engine="pyarrow")
 
 
-def test_diff_candidates():
-    prof = load_csv(CSV_DIR / "diff_cands.csv", id_col=0)
-    abe = Ballot(ranking=[{"a"}, {"b"}, {"c"}], voter_set={"abe"}, weight=Fraction(1))
-    don = Ballot(ranking=[{"d"}, {"e"}, {"f"}], weight=Fraction(1), voter_set={"don"})
-    carrie = Ballot(
-        ranking=[{"g"}, {"h"}, {"i"}], weight=Fraction(1), voter_set={"carrie"}
-    )
-    correct_prof = PreferenceProfile(ballots=[abe, don, carrie])
-    assert is_equal(correct_prof.ballots, prof.ballots)
+CSV_UNDERVOTE = "name,1,2,3\na,c,,\n"
+
 
+@pytest.mark.parametrize("engine", ENGINES)
+def test_load_csv_buffer(engine):
+    prof = load_csv(io.StringIO(CSV_UNDERVOTE), id_col=0, engine=engine)
+    assert Counter(map(ballot_key, prof.ballots)) == EXPECTED_KEYS["undervote.csv"]
 
-def test_same_candidates():
-    prof = load_csv(CSV_DIR / "same_cands.csv", id_col=0)
-    abe = Ballot(ranking=[{"a"}, {"b"}, {"c"}], voter_set={"abe"}, weight=Fraction(1))
-    don = Ballot(ranking=[{"c"}, {"b"}, {"a"}], weight=Fraction(1), voter_set={"don"})
-    carrie = Ballot(
-        ranking=[{"a"}, {"c"}, {"b"}], weight=Fraction(1), voter_set={"carrie"}
+
+@pytest.mark.parametrize("csv_case", CSV_NAMES, indirect=True)
+def test_load_csv_buffer_matches_path(csv_cache, csv_case):
+    # reading the same text from memory and from disk gives the same ballots
+    fpath, _ = csv_case
+    buffer = io.StringIO(fpath.read_text(encoding="utf8"))
+    prof = load_csv(buffer, id_col=0)
+    from_path = cached_load_csv(csv_cache, fpath, id_col=0)
+    assert Counter(map(ballot_key, prof.ballots)) == Counter(
+        map(ballot_key, from_path.ballots)
     )
-    correct_prof = PreferenceProfile(ballots=[abe, don, carrie])
-    assert is_equal(correct_prof.ballots, prof.ballots)
 
 
-def test_special_char():
-    prof = load_csv(CSV_DIR / "special_char.csv", id_col=0)
-    a1 = Ballot(
-        ranking=[{"b@#"}, {"@#$"}, {"c"}], weight=Fraction(2), voter_set={"a@#", "1@#"}
+def test_load_csv_many_ballots(tmp_path):
+    rng = random.Random(2024)
+    cands = ["a", "b", "c", "d", ""]
+    rows = {f"v{i}": tuple(rng.choice(cands) for _ in range(4)) for i in range(2_000)}
+    fpath = tmp_path / "many.csv"
+    fpath.write_text(
+        "name,1,2,3,4\n"
+        + "\n".join(f"{voter},{','.join(ranks)}" for voter, ranks in rows.items())
+        + "\n"
     )
-    d = Ballot(ranking=[{"!23"}, {"c"}, {"c"}], weight=Fraction(1), voter_set={"d#$"})
-    correct_prof = PreferenceProfile(ballots=[a1, d])
-    assert is_equal(correct_prof.ballots, prof.ballots)
 
+    voters_by_ranking: dict = {}
+    for voter, ranks in rows.items():
+        ranking = tuple(frozenset({r if r else None}) for r in ranks)
+        voters_by_ranking.setdefault(ranking, set()).add(voter)
+    expected = Counter(
+        (ranking, Fraction(len(voters)), frozenset(voters), None)
+        for ranking, voters in voters_by_ranking.items()
+    )
 
-def test_unnamed_ballot():
-    with pytest.raises(ValueError):
-        load_csv(CSV_DIR / "unnamed.csv", id_col=0)
+    prof = load_csv(fpath, id_col=0)
+    assert Counter(map(ballot_key, prof.ballots)) == expected
+    # ballots come out sorted by ranking, with empty cells after every candidate
+    rankings = [[next(iter(s)) or "~" for s in b.ranking] for b in prof.ballots]
+    assert rankings == sorted(rankings)
 
 
-def test_same_name():
-    with pytest.raises(DataError):
-        load_csv(CSV_DIR / "same_name.csv", id_col=0)
+def test_large_equality():
+    rng = random.Random(8)
+    cands = ["a", "b", "c", "d", "e", "f", None]
+    ballots = [
+        Ballot(
+            ranking=tuple(frozenset({c}) for c in rng.sample(cands, rng.randint(1, 4))),
+            weight=Fraction(rng.randint(1, 9), rng.randint(1, 3)),
+        )
+        for _ in range(5_000)
+    ]
+    shuffled = rng.sample(ballots, len(ballots))
+
+    assert is_equal_array(ballots, shuffled)
+    assert is_equal(ballots, shuffled)
+
+    changed = shuffled[:-1] + [
+        Ballot(ranking=shuffled[-1].ranking, weight=shuffled[-1].weight + 1)
+    ]
+    assert not is_equal_array(ballots, changed)
+    assert not is_equal(ballots, changed)
+    assert not is_equal_array(ballots, shuffled[:-1])
+
+
+@pytest.mark.parametrize("fname", CSV_NAMES)
+def test_benchmark_load_csv(benchmark, csv_cache, fname):
+    benchmark.group = "load_csv"
+    prof = benchmark(load_csv, csv_path(fname), id_col=0)
+    expected = cached_load_csv(csv_cache, csv_path(fname), id_col=0)
+    assert Counter(map(ballot_key, prof.ballots)) == Counter(
+        map(ballot_key, expected.ballots)
+    )
+
+
+def test_benchmark_load_scottish(benchmark, scot_cache):
+    benchmark.group = "load_scottish"
+    fpath = csv_path("scot_wardy_mc_ward.csv")
+    pp, seats, *rest = benchmark(load_scottish, fpath)
+    expected_pp, expected_seats, *expected_rest = cached_load_scottish(
+        scot_cache, fpath
+    )
+    assert seats == expected_seats == 1
+    assert rest == expected_rest
+    assert Counter(map(ballot_key, pp.ballots)) == Counter(
+        map(ballot_key, expected_pp.ballots)
+    )
 
 
 # def malformed_rows():
@@ -160,38 +560,10 @@ def test_same_name():
 #     # print(p)
 
 
-def test_scot_csv_parse():
-    pp, seats, cand_list, cand_to_party, ward = load_scottish(
-        CSV_DIR / "scot_wardy_mc_ward.csv"
-    )
-
-    assert seats == 1
-    assert isinstance(pp, PreferenceProfile)
-    assert set(["Paul", "George", "Ringo"]) == set(pp.get_candidates())
-    assert len(pp.get_candidates()) == 3
-    assert cand_list == ["Paul", "George", "Ringo"]
-    assert cand_to_party == {
-        "Paul": "Orange (O)",
-        "George": "Yellow (Y)",
-        "Ringo": "Red (R)",
-    }
-    assert ward == "Wardy McWard Ward"
-    assert int(pp.num_ballots()) == 146
-    assert Ballot(ranking=tuple([frozenset({"Paul"})]), weight=126) in pp.ballots
-    assert (
-        Ballot(
-            ranking=tuple(
-                [frozenset({"Ringo"}), frozenset({"George"}), frozenset({"Paul"})]
-            ),
-            weight=1,
-        )
-        in pp.ballots
-    )
-
-
-def test_scot_csv_blank_rows():
-    pp, seats, cand_list, cand_to_party, ward = load_scottish(
-        CSV_DIR / "scot_blank_rows.csv"
+@pytest.mark.parametrize("fname", ["scot_wardy_mc_ward.csv", "scot_blank_rows.csv"])
+def test_scot_csv_parse(scot_cache, fname):
+    pp, seats, cand_list, cand_to_party, ward = cached_load_scottish(
+        scot_cache, csv_path(fname)
     )
 
     assert seats == 1
@@ -219,23 +591,23 @@ def test_scot_csv_blank_rows():
 
 
 def test_bad_file_path_scot_csv():
-    with pytest.raises(FileNotFoundError):
+    with pytest.raises(FileNotFoundError, match="cannot be found"):
         load_scottish("")
 
 
 def test_empty_file_scot_csv():
-    with pytest.raises(EmptyDataError):
-        load_scottish(CSV_DIR / "scot_empty.csv")
+    with pytest.raises(EmptyDataError, match="is empty"):
+        load_scottish(csv_path("scot_empty.csv"))
 
 
 def test_bad_metadata_scot_csv():
-    with pytest.raises(DataError):
-        load_scottish(CSV_DIR / "scot_bad_metadata.csv")
+    with pytest.raises(DataError, match="The metadata in the first row"):
+        load_scottish(csv_path("scot_bad_metadata.csv"))
 
 
 def test_incorrect_metadata_scot_csv():
-    with pytest.raises(DataError):
-        load_scottish(CSV_DIR / "scot_candidate_overcount.csv")
+    with pytest.raises(DataError, match="Incorrect number of candidates"):
+        load_scottish(csv_path("scot_candidate_overcount.csv"))
 
-    with pytest.raises(DataError):
-        load_scottish(CSV_DIR / "scot_candidate_undercount.csv")
+    with pytest.raises(DataError, match="Incorrect number of candidates"):
+        load_scottish(csv_path("scot_candidate_undercount.csv"))